@@ -0,0 +1,21 @@
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from sso2.core.warmup import run_warmups
+
+app = typer.Typer()
+console = Console()
+
+
+@app.command("warm")
+def warm() -> None:
+    """Run the cache warm-ups a worker runs at boot and show what they load."""
+    table = Table("Warm-up", "Loaded", "Seconds")
+    for name, (loaded, seconds) in run_warmups().items():
+        table.add_row(name, str(loaded), f"{seconds:.3f}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    app()
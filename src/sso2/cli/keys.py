@@ -0,0 +1,62 @@
+import time
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from sso2.core.keyutils import JwsAlgorithm, count_pooled_keys, fill_key_pool
+from sso2.core.models import EncryptedKey, Tenant, TenantSigningKey
+
+app = typer.Typer()
+console = Console()
+
+
+@app.command("fill-pool")
+def fill_pool(
+    algorithms: list[JwsAlgorithm] = typer.Option(
+        [JwsAlgorithm.RS256],
+        "--algorithm",
+    ),
+    size: int = typer.Option(100),
+    watch: int = typer.Option(
+        0,
+        help="Keep the pool filled, checking every WATCH seconds.",
+    ),
+) -> None:
+    """Generate signing keys ahead of time, so new tenants get one instantly."""
+    while True:
+        for algorithm in algorithms:
+            generated = fill_key_pool(algorithm, size)
+            if generated:
+                console.print(f"Generated {generated} {algorithm} keys")
+        if not watch:
+            break
+        time.sleep(watch)
+
+
+@app.command("pool")
+def show_pool() -> None:
+    table = Table("Algorithm", "Keys")
+    for algorithm in JwsAlgorithm:
+        try:
+            count = count_pooled_keys(algorithm)
+        except KeyError:
+            continue
+        table.add_row(algorithm, str(count))
+    console.print(table)
+
+
+@app.command("migrate")
+def migrate_keys() -> None:
+    """Move tenant keys kept as files into the encrypted database store."""
+    for model in [Tenant, TenantSigningKey]:
+        for owner in model.objects.filter(key__isnull=True):
+            owner.key = EncryptedKey.store(owner.get_private_key(), owner.algorithm)
+            owner.public_key_path = ""
+            owner.private_key_path = ""
+            owner.save(update_fields=["key", "public_key_path", "private_key_path"])
+            console.print(f"Moved {owner} key {owner.key.kid}")
+
+
+if __name__ == "__main__":
+    app()
@@ -8,11 +8,15 @@ django.setup()
 
 import typer
 
-from sso2.cli import client, tenant, user  # connection
+from sso2.cli import cache, client, keys, passwords, tenant, tokens, user  # connection
 
 main_app = typer.Typer(pretty_exceptions_enable=False)
+main_app.add_typer(cache.app, name="cache")
 main_app.add_typer(client.app, name="client")
+main_app.add_typer(keys.app, name="keys")
+main_app.add_typer(passwords.app, name="passwords")
 main_app.add_typer(tenant.app, name="tenant")
+main_app.add_typer(tokens.app, name="tokens")
 main_app.add_typer(user.app, name="user")
 
 
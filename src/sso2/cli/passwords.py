@@ -0,0 +1,100 @@
+import itertools
+import os
+from pathlib import Path
+
+import typer
+from django.conf import settings
+from rich.console import Console
+from rich.table import Table
+
+from sso2.core.password_calibration import (
+    Argon2Parameters,
+    calibrate,
+    simulate_logins,
+)
+
+app = typer.Typer()
+console = Console()
+
+
+@app.command("calibrate")
+def calibrate_command(
+    target_ms: float = typer.Option(250, help="p99 latency of a login, in ms."),
+    logins_per_second: float = typer.Option(20, help="Expected peak login rate."),
+    memory_cost: list[int] = typer.Option(
+        [19456, 47104, 65536, 102400],
+        help="Memory costs to try, in KiB.",
+    ),
+    time_cost: list[int] = typer.Option([1, 2, 3, 4]),
+    parallelism: list[int] = typer.Option([1, 2, 4]),
+    samples: int = typer.Option(10),
+    duration: float = typer.Option(5, help="Seconds to simulate the login rate."),
+    output: Path | None = typer.Option(None, help="Write the settings here."),
+) -> None:
+    """Benchmark Argon2id parameters and recommend settings for this machine."""
+    cores = os.cpu_count() or 1
+    candidates = [
+        Argon2Parameters(time_cost=t, memory_cost=m, parallelism=p)
+        for m, t, p in itertools.product(memory_cost, time_cost, parallelism)
+    ]
+    best, measurements = calibrate(
+        candidates,
+        target_latency=target_ms / 1000,
+        logins_per_second=logins_per_second,
+        samples=samples,
+        cores=cores,
+    )
+
+    table = Table(
+        "Time cost",
+        "Memory (KiB)",
+        "Parallelism",
+        "Mean (ms)",
+        "p99 (ms)",
+        "Logins/s per core",
+        "Cores used",
+    )
+    for measurement in measurements:
+        parameters = measurement.parameters
+        table.add_row(
+            str(parameters.time_cost),
+            str(parameters.memory_cost),
+            str(parameters.parallelism),
+            f"{measurement.mean * 1000:.1f}",
+            f"{measurement.p99 * 1000:.1f}",
+            f"{measurement.per_core_throughput:.1f}",
+            f"{measurement.utilization(logins_per_second, cores) * cores:.2f}",
+        )
+    console.print(table)
+
+    if best is None:
+        console.print(
+            f"No parameters verify {logins_per_second} logins/s within "
+            f"{target_ms} ms on {cores} cores, add cheaper candidates.",
+        )
+        raise typer.Exit(1)
+
+    p99 = simulate_logins(
+        best,
+        logins_per_second=logins_per_second,
+        duration=duration,
+        workers=settings.PASSWORD_HASH_WORKERS,
+    )
+    console.print(
+        f"At {logins_per_second} logins/s on {settings.PASSWORD_HASH_WORKERS} "
+        f"hashing threads the p99 login latency is {p99 * 1000:.1f} ms",
+    )
+    recommendation = (
+        f"ARGON2_TIME_COST = {best.time_cost}\n"
+        f"ARGON2_MEMORY_COST = {best.memory_cost}\n"
+        f"ARGON2_PARALLELISM = {best.parallelism}\n"
+    )
+    if output is None:
+        console.print(recommendation)
+    else:
+        output.write_text(recommendation)
+        console.print(f"Wrote the recommended settings to {output}")
+
+
+if __name__ == "__main__":
+    app()
@@ -1,7 +1,11 @@
+import csv
+from pathlib import Path
+
 import typer
 from rich.console import Console
 from rich.table import Table
 
+from sso2.core.key_rotation import rotate_signing_keys
 from sso2.core.keyutils import JwsAlgorithm, key_dir
 from sso2.core.models.tenant_model import Tenant
 
@@ -23,6 +27,33 @@ def create_tenant(
     tenant.save()
 
 
+@app.command("import")
+def import_tenants(
+    path: Path,
+    algorithm: JwsAlgorithm = JwsAlgorithm.RS256,
+) -> None:
+    """Create the tenants listed in a CSV file with name and display_name
+    columns. Run 'keys fill-pool' first to avoid generating keys here."""
+    with path.open(newline="") as f:
+        rows = list(csv.DictReader(f))
+    existing = set(
+        Tenant.objects.filter(name__in=[row["name"] for row in rows]).values_list(
+            "name",
+            flat=True,
+        ),
+    )
+    tenants = []
+    for row in rows:
+        if row["name"] in existing:
+            console.print(f"Skipping existing tenant: {row['name']}")
+            continue
+        tenant = Tenant.create_example(name=row["name"], algorithm=algorithm)
+        tenant.display_name = row.get("display_name", "")
+        tenants.append(tenant)
+    Tenant.objects.bulk_create(tenants, batch_size=500)
+    console.print(f"Created {len(tenants)} tenants")
+
+
 @app.command("delete")
 def delete_tenant(tenant: str) -> None:
     print(f"Deleting user: {tenant}")
@@ -47,5 +78,26 @@ def list_tenants() -> None:
     console.print(table)
 
 
+@app.command("rotate-keys")
+def rotate_keys(
+    tenant_name: str | None = typer.Option(None, "--tenant"),
+) -> None:
+    """Rotate the signing keys that are due, meant to be run daily."""
+    tenants = Tenant.objects.all()
+    if tenant_name is not None:
+        tenants = tenants.filter(name=tenant_name)
+
+    table = Table("Tenant", "Kid", "State", "Since")
+    for tenant in tenants:
+        for key in rotate_signing_keys(tenant):
+            table.add_row(
+                tenant.name,
+                key.kid,
+                key.state,
+                key.state_changed_at.isoformat(timespec="seconds"),
+            )
+    console.print(table)
+
+
 if __name__ == "__main__":
     app()
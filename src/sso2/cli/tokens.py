@@ -0,0 +1,18 @@
+import typer
+from rich.console import Console
+
+from sso2.core.models import RevokedToken
+
+app = typer.Typer()
+console = Console()
+
+
+@app.command("prune")
+def prune() -> None:
+    """Delete revoked token entries whose tokens have expired."""
+    deleted = RevokedToken.delete_expired()
+    console.print(f"Deleted {deleted} expired revoked tokens")
+
+
+if __name__ == "__main__":
+    app()
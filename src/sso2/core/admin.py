@@ -7,7 +7,7 @@ from django.db.models import Field, TextField
 from django.forms import TextInput
 from django.utils.safestring import SafeString
 
-from sso2.core.models import Tenant
+from sso2.core.models import EncryptedKey, RevokedToken, Tenant, TenantSigningKey
 from sso2.core.models.user_model import User
 from sso2.core.urlutils import build_change_url
 
@@ -40,3 +40,40 @@ class TenantCodeAdmin(admin.ModelAdmin[Tenant]):
 
 
 admin.site.register(Tenant, TenantCodeAdmin)
+
+
+class RevokedTokenAdmin(admin.ModelAdmin[RevokedToken]):
+    list_display = [
+        "jti",
+        "tenant",
+        "expires_at",
+    ]
+
+
+admin.site.register(RevokedToken, RevokedTokenAdmin)
+
+
+class TenantSigningKeyAdmin(admin.ModelAdmin[TenantSigningKey]):
+    list_display = [
+        "kid",
+        "tenant",
+        "algorithm",
+        "state",
+        "state_changed_at",
+    ]
+    list_filter = ["state"]
+
+
+admin.site.register(TenantSigningKey, TenantSigningKeyAdmin)
+
+
+class EncryptedKeyAdmin(admin.ModelAdmin[EncryptedKey]):
+    list_display = [
+        "kid",
+        "algorithm",
+        "created_at",
+    ]
+    exclude = ["encrypted_private_key"]
+
+
+admin.site.register(EncryptedKey, EncryptedKeyAdmin)
@@ -1,6 +1,39 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "sso2.core"
+
+    def ready(self) -> None:
+        if (
+            settings.TENANT_KEY_STORAGE == "database"
+            and not settings.KEY_ENCRYPTION_KEYS
+        ):
+            # Refuse to start rather than fail on the first new tenant
+            raise ImproperlyConfigured(
+                "KEY_ENCRYPTION_KEYS must be set when TENANT_KEY_STORAGE is "
+                '"database"',
+            )
+
+        from sso2.core.key_store import key_changed
+        from sso2.core.keyring import invalidate_rotated_keys, invalidate_tenant_keys
+        from sso2.core.revoked_tokens import token_revoked, warm_revoked_tokens
+        from sso2.core.tenant_cache import invalidate_cached_tenant
+        from sso2.core.warmup import register_warmup, warm_tenants
+
+        post_save.connect(key_changed, sender="core.EncryptedKey")
+        post_delete.connect(key_changed, sender="core.EncryptedKey")
+        post_save.connect(invalidate_tenant_keys, sender="core.Tenant")
+        post_delete.connect(invalidate_tenant_keys, sender="core.Tenant")
+        post_save.connect(invalidate_rotated_keys, sender="core.TenantSigningKey")
+        post_delete.connect(invalidate_rotated_keys, sender="core.TenantSigningKey")
+        post_save.connect(token_revoked, sender="core.RevokedToken")
+        post_save.connect(invalidate_cached_tenant, sender="core.Tenant")
+        post_delete.connect(invalidate_cached_tenant, sender="core.Tenant")
+
+        register_warmup("tenants", warm_tenants)
+        register_warmup("revoked-tokens", warm_revoked_tokens)
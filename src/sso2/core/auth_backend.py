@@ -3,8 +3,10 @@ from typing import Any
 from django.contrib.auth.backends import ModelBackend
 from django.http import HttpRequest
 
+from sso2.core.login_throttle import get_client_ip, throttle_login
 from sso2.core.models.tenant_model import Tenant
 from sso2.core.models.user_model import User
+from sso2.core.password_hashing import check_dummy_password, check_password
 
 
 class DjangoAuthBackend(ModelBackend):
@@ -19,6 +21,12 @@ class DjangoAuthBackend(ModelBackend):
         email = kwargs.pop("email", None)
         if (username is None and email is None) or password is None:
             return None
+        # Refused attempts must not cost a password hash
+        throttle_login(
+            tenant_id=None if tenant is None else tenant.id,
+            username=str(username or email),
+            ip=get_client_ip(request),
+        )
         query_filters: dict[str, Any] = kwargs
         if tenant is not None:
             query_filters["tenant"] = tenant
@@ -30,10 +38,10 @@ class DjangoAuthBackend(ModelBackend):
             user = User.objects.get(**query_filters)
         except User.DoesNotExist:
             print(f"no such user: {email} {query_filters}")
-            # Run the default password hasher once to reduce the timing
-            # difference between an existing and a nonexistent user (#20760).
-            User().set_password(password)
+            # Reduce the timing difference between an existing and a
+            # nonexistent user (#20760)
+            check_dummy_password(None if tenant is None else tenant.id, password)
         else:
-            if user.check_password(password) and self.user_can_authenticate(user):
+            if check_password(user, password) and self.user_can_authenticate(user):
                 return user
         return None
@@ -1,4 +1,8 @@
-from typing import TYPE_CHECKING, NamedTuple
+import dataclasses
+import hashlib
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from authlib.jose import jwt
 from authlib.jose.errors import (
@@ -11,7 +15,10 @@ from rest_framework import authentication
 from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
 from rest_framework.request import Request
 
+from sso2.core.keyring import keyring
+from sso2.core.lru import LRUCache
 from sso2.core.models import User
+from sso2.core.revoked_tokens import revoked_tokens
 
 if TYPE_CHECKING:
     from authlib.jose import JWTClaims
@@ -25,6 +32,50 @@ class AuthorizationHeaderParseResult(NamedTuple):
     claims: "JWTClaims"
 
 
+# The user fields API requests need, other fields load when accessed.
+# In model order, which User.from_db() expects them in.
+USER_SNAPSHOT_FIELDS = (
+    "id",
+    "is_superuser",
+    "username",
+    "first_name",
+    "last_name",
+    "email",
+    "is_staff",
+    "is_active",
+    "tenant_id",
+    "email_verified",
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class VerifiedToken:
+    claims: "JWTClaims"
+    user_values: tuple[Any, ...]
+
+    def get_user(self) -> User:
+        # A new instance per request, so callers may modify it
+        return User.from_db("default", USER_SNAPSHOT_FIELDS, self.user_values)
+
+    @classmethod
+    def from_user(cls, claims: "JWTClaims", user: User) -> "VerifiedToken":
+        return cls(
+            claims=claims,
+            user_values=tuple(getattr(user, field) for field in USER_SNAPSHOT_FIELDS),
+        )
+
+
+# Clients such as the admin SPA send the same token with dozens of requests.
+# Once verified, its claims and user are kept until the token expires, at most
+# settings.VERIFIED_TOKEN_CACHE_TTL seconds, which bounds how long a
+# deactivated user keeps access. Revocation is checked on every request.
+verified_tokens: LRUCache[tuple[uuid.UUID, bytes], VerifiedToken] = LRUCache(
+    "verified_tokens",
+    size_setting="VERIFIED_TOKEN_CACHE_SIZE",
+    ttl_setting="VERIFIED_TOKEN_CACHE_TTL",
+)
+
+
 # Note: This depends on a tenant so we know which public key to use to decode
 def parse_authorization_header(
     *,
@@ -35,15 +86,28 @@ def parse_authorization_header(
         raise AuthenticationFailed("Invalid authentication header")
 
     token = authorization_header[len("Bearer ") :]
+    key = (tenant.id, hashlib.sha256(token.encode()).digest())
+    verified = verified_tokens.get(key)
+    if verified is not None and verified.claims["exp"] > time.time():
+        check_revoked(tenant, verified.claims)
+        return AuthorizationHeaderParseResult(
+            user=verified.get_user(),
+            token=token,
+            claims=verified.claims,
+        )
+
     try:
         claims = jwt.decode(
             token,
-            tenant.get_public_key(),
+            keyring.get(tenant).key_set,
             claims_options={
                 "iss": {"essential": True, "values": [tenant.get_issuer()]},
                 "exp": {"essential": True},
             },
         )
+    except ValueError as e:
+        # Raised by the key set when no published key matches the kid
+        raise AuthenticationFailed("Unknown signing key") from e
     except BadSignatureError as e:
         raise AuthenticationFailed("Invalid token signature") from e
     except DecodeError as e:
@@ -56,11 +120,17 @@ def parse_authorization_header(
     except ExpiredTokenError as e:
         raise AuthenticationFailed("Token expired") from e
 
+    check_revoked(tenant, claims)
+
     try:
-        user = User.objects.get(id=claims["sub"], is_active=True)
+        user = User.objects.only(*USER_SNAPSHOT_FIELDS).get(
+            id=claims["sub"],
+            is_active=True,
+        )
     except User.DoesNotExist as e:
         raise AuthenticationFailed('Invalid claim "sub"') from e
 
+    verified_tokens.put(key, VerifiedToken.from_user(claims, user))
     return AuthorizationHeaderParseResult(
         user=user,
         token=token,
@@ -68,6 +138,12 @@ def parse_authorization_header(
     )
 
 
+def check_revoked(tenant: "Tenant", claims: "JWTClaims") -> None:
+    jti = claims.get("jti")
+    if jti is not None and revoked_tokens.is_revoked(tenant.id, jti):
+        raise AuthenticationFailed("Token revoked")
+
+
 class JWTAuthentication(authentication.BaseAuthentication):
     def authenticate(self, request: Request) -> tuple[User, str] | None:
         if True:
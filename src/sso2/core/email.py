@@ -8,6 +8,7 @@ from django.conf import settings
 from django.core.mail import send_mail
 from django.urls import reverse
 
+from sso2.core.keyring import keyring
 from sso2.core.models.user_model import User
 from sso2.django_project.settings.local import FROM_EMAIL
 
@@ -28,8 +29,6 @@ Please reset your password by clicking this link:
 def generate_email_token(user: "User") -> str:
     tenant = user.tenant
     assert tenant is not None
-    private_key = tenant.get_private_key()
-    header = {"alg": tenant.algorithm, "kid": private_key.thumbprint()}
     now = int(time.time())
     payload = {
         "exp": now + 3600,
@@ -40,14 +39,13 @@ def generate_email_token(user: "User") -> str:
         "email": user.email,
         "email_verified": True,
     }
-    return str(jwt.encode(header, payload, private_key).decode())
+    return keyring.get(tenant).sign(payload)
 
 
 def decode_email_token(*, tenant: "Tenant", token: str) -> JWTClaims:
-    public_key = tenant.get_public_key()
     claims = jwt.decode(
         token,
-        public_key,
+        keyring.get(tenant).key_set,
         claims_options={
             "iss": {"essential": True, "values": [tenant.get_issuer()]},
             "exp": {"essential": True},
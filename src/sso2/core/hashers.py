@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class TunedArgon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id with its cost taken from the ARGON2_TIME_COST,
+    ARGON2_MEMORY_COST and ARGON2_PARALLELISM settings, as recommended by
+    ``ssotool passwords calibrate`` for the machine.
+
+    Hashes made with other parameters still verify and are rehashed with the
+    current ones at the next successful login.
+    """
+
+    @property  # type: ignore[override]
+    def time_cost(self) -> int:
+        return int(settings.ARGON2_TIME_COST)
+
+    @property  # type: ignore[override]
+    def memory_cost(self) -> int:
+        return int(settings.ARGON2_MEMORY_COST)
+
+    @property  # type: ignore[override]
+    def parallelism(self) -> int:
+        return int(settings.ARGON2_PARALLELISM)
@@ -0,0 +1,69 @@
+"""Scheduled rotation of tenant signing keys.
+
+Run ``ssotool tenant rotate-keys`` periodically (daily is plenty), each run
+advances the keys of every tenant that is due:
+
+* a tenant without keys adopts the key it was created with as active,
+* the active key is replaced by the next key once it is older than
+  ``settings.SIGNING_KEY_ROTATION_INTERVAL`` and becomes retiring,
+* retiring keys are retired after ``settings.SIGNING_KEY_OVERLAP``,
+* a new next key is generated whenever there is none.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from sso2.core.models import Tenant, TenantSigningKey
+from sso2.core.models.tenant_signing_key_model import (
+    PUBLISHED_STATES,
+    SigningKeyState,
+)
+
+
+def rotate_signing_keys(
+    tenant: Tenant,
+    *,
+    now: datetime.datetime | None = None,
+) -> list[TenantSigningKey]:
+    """Advance the rotation of tenant's keys, returns its published keys."""
+    if now is None:
+        now = timezone.now()
+    overlap = settings.SIGNING_KEY_OVERLAP
+
+    with transaction.atomic():
+        keys = list(
+            TenantSigningKey.objects.select_for_update()
+            .filter(tenant=tenant, state__in=PUBLISHED_STATES)
+            .order_by("created_at"),
+        )
+        active = next((k for k in keys if k.state == SigningKeyState.ACTIVE), None)
+        next_key = next((k for k in keys if k.state == SigningKeyState.NEXT), None)
+        retiring = [k for k in keys if k.state == SigningKeyState.RETIRING]
+
+        if active is None:
+            active = TenantSigningKey.adopt_tenant_key(tenant, now=now)
+
+        # The next key must have been published for a full overlap window,
+        # otherwise resource servers may not have it in their JWKS cache yet.
+        if (
+            next_key is not None
+            and active.state_changed_at + settings.SIGNING_KEY_ROTATION_INTERVAL <= now
+            and next_key.state_changed_at + overlap <= now
+        ):
+            active.set_state(SigningKeyState.RETIRING, now=now)
+            retiring.append(active)
+            next_key.set_state(SigningKeyState.ACTIVE, now=now)
+            next_key = None
+
+        for key in retiring:
+            if key.state_changed_at + overlap <= now:
+                key.set_state(SigningKeyState.RETIRED, now=now)
+
+        if next_key is None:
+            TenantSigningKey.generate(tenant=tenant, now=now)
+
+    return list(
+        TenantSigningKey.objects.filter(tenant=tenant, state__in=PUBLISHED_STATES),
+    )
@@ -0,0 +1,142 @@
+"""Tenant signing keys stored encrypted in the database.
+
+Decrypted keys are kept in a bounded in-memory LRU cache. Entries expire after
+``settings.KEY_STORE_CACHE_TTL`` seconds, and every worker drops its cache
+when another process changes a key, which it notices by polling the "keys"
+CacheGeneration at most every ``settings.KEY_STORE_POLL_INTERVAL`` seconds.
+"""
+import dataclasses
+import time
+from functools import lru_cache
+from typing import Any
+
+from authlib.jose import JsonWebKey
+from cryptography.fernet import Fernet, MultiFernet
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from sso2.core.keyutils import (
+    JwsAlgorithm,
+    TenantKey,
+    create_key_pair,
+    generate_private_key,
+    take_pooled_key,
+)
+from sso2.core.lru import LRUCache
+from sso2.core.models.cache_generation_model import CacheGeneration
+from sso2.core.models.encrypted_key_model import EncryptedKey
+
+GENERATION_NAME = "keys"
+
+
+@lru_cache
+def _get_fernet(*keys: str) -> MultiFernet:
+    return MultiFernet([Fernet(key) for key in keys])
+
+
+def get_fernet() -> MultiFernet:
+    if not settings.KEY_ENCRYPTION_KEYS:
+        raise ImproperlyConfigured(
+            "KEY_ENCRYPTION_KEYS must be set to store or read tenant keys",
+        )
+    return _get_fernet(*settings.KEY_ENCRYPTION_KEYS)
+
+
+def encrypt_private_key(private_key: TenantKey) -> bytes:
+    """Encrypt with the first of settings.KEY_ENCRYPTION_KEYS, the others are
+    only used to decrypt keys stored before the encryption key was changed."""
+    return get_fernet().encrypt(private_key.as_pem(is_private=True))
+
+
+def decrypt_private_key(encrypted_private_key: bytes) -> TenantKey:
+    fernet = get_fernet()
+    return JsonWebKey.import_key(fernet.decrypt(bytes(encrypted_private_key)))
+
+
+@dataclasses.dataclass(frozen=True)
+class NewKey:
+    private_key: TenantKey
+    stored: EncryptedKey | None = None
+    public_key_path: str = ""
+    private_key_path: str = ""
+
+
+def create_signing_key(*, basename: str, algorithm: JwsAlgorithm) -> NewKey:
+    """Create a key for a tenant, stored as settings.TENANT_KEY_STORAGE says.
+
+    With "database" the key is encrypted into an EncryptedKey row, with
+    "files" it is written as PEM files into keyutils.key_dir.
+    """
+    if settings.TENANT_KEY_STORAGE == "database":
+        private_key = take_pooled_key(algorithm) or generate_private_key(algorithm)
+        return NewKey(
+            private_key=private_key,
+            stored=EncryptedKey.store(private_key, algorithm),
+        )
+    public_key, private_key_file = create_key_pair(
+        basename=basename,
+        algorithm=algorithm,
+    )
+    return NewKey(
+        private_key=private_key_file.key,
+        public_key_path=str(public_key.path),
+        private_key_path=str(private_key_file.path),
+    )
+
+
+class KeyStore:
+    def __init__(self) -> None:
+        self._keys: LRUCache[int, tuple[TenantKey, TenantKey]] = LRUCache(
+            "key_store",
+            size_setting="KEY_STORE_CACHE_SIZE",
+            ttl_setting="KEY_STORE_CACHE_TTL",
+        )
+        self._generation: int | None = None
+        self._next_poll = 0.0
+
+    def get_private_key(self, key_id: int) -> TenantKey:
+        return self._get(key_id)[0]
+
+    def get_public_key(self, key_id: int) -> TenantKey:
+        return self._get(key_id)[1]
+
+    def _get(self, key_id: int) -> tuple[TenantKey, TenantKey]:
+        self.poll()
+        keys = self._keys.get(key_id)
+        if keys is None:
+            stored = EncryptedKey.objects.get(pk=key_id)
+            keys = (
+                decrypt_private_key(stored.encrypted_private_key),
+                stored.get_public_key(),
+            )
+            self._keys.put(key_id, keys)
+        return keys
+
+    def poll(self) -> None:
+        """Drop the cache if another process has changed a key."""
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+        self._next_poll = now + settings.KEY_STORE_POLL_INTERVAL
+        generation = CacheGeneration.current(GENERATION_NAME)
+        if generation != self._generation:
+            self.clear()
+            self._generation = generation
+
+    def clear(self) -> None:
+        self._keys.clear()
+
+
+key_store = KeyStore()
+
+
+def key_changed(
+    sender: type,
+    instance: EncryptedKey,
+    created: bool = False,  # noqa: FBT001, FBT002
+    **kwargs: Any,
+) -> None:
+    # A new key cannot be cached anywhere yet
+    if not created:
+        key_store.clear()
+        CacheGeneration.bump(GENERATION_NAME)
@@ -0,0 +1,158 @@
+"""Process-wide cache of prepared tenant signing keys."""
+import dataclasses
+import hashlib
+import uuid
+from typing import TYPE_CHECKING, Any
+
+from authlib.common.encoding import json_b64encode, json_dumps, urlsafe_b64encode
+from authlib.jose import JsonWebKey, JsonWebSignature, JWSAlgorithm, KeySet
+
+from sso2.core.keyutils import TenantKey
+from sso2.core.lru import LRUCache
+from sso2.core.models.tenant_signing_key_model import (
+    PUBLISHED_STATES,
+    SigningKeyState,
+    TenantSigningKey,
+)
+from sso2.core.types import JwtConfig
+
+if TYPE_CHECKING:
+    from sso2.core.models.tenant_model import Tenant
+
+
+@dataclasses.dataclass(frozen=True)
+class SigningKey:
+    """Everything needed to sign a JWT for a tenant, computed once.
+
+    The thumbprint (``kid``) and the base64url encoded protected header only
+    depend on the tenant key and algorithm, so they are kept here instead of
+    being recomputed for every token. The same goes for the serialized JWKS
+    document and its ETag.
+
+    Tokens are signed with the tenant's active key. The key set used for
+    verification and the JWKS also hold the next and retiring keys, see
+    :mod:`sso2.core.key_rotation`. Tenants whose keys have never been
+    rotated only have the key they were created with.
+    """
+
+    key: TenantKey
+    kid: str
+    algorithm: JWSAlgorithm
+    issuer: str
+    protected_header: bytes
+    jwt_config: JwtConfig
+    key_set: KeySet
+    jwks: bytes
+    jwks_etag: str
+
+    @classmethod
+    def from_tenant(cls, tenant: "Tenant") -> "SigningKey":
+        keys = list(
+            TenantSigningKey.objects.filter(
+                tenant=tenant,
+                state__in=PUBLISHED_STATES,
+            ).order_by("created_at"),
+        )
+        active = next((k for k in keys if k.state == SigningKeyState.ACTIVE), None)
+        if active is None:
+            private_key = tenant.get_private_key()
+            alg = tenant.algorithm
+            published = [(private_key, alg)]
+        else:
+            private_key = active.get_private_key()
+            alg = active.algorithm
+            published = [(k.get_public_key(), k.algorithm) for k in keys]
+        jwks_data = {
+            "keys": [
+                key.as_dict(is_private=False, alg=key_alg, use="sig")
+                for key, key_alg in published
+            ],
+        }
+        jwks = json_dumps(jwks_data).encode("utf-8")
+
+        algorithm = JsonWebSignature.ALGORITHMS_REGISTRY[alg]
+        kid = private_key.thumbprint()
+        # Matches the header authlib's jwt.encode() produces
+        header = {"typ": "JWT", "alg": alg, "kid": kid}
+        # authlib only puts a kid in the ID token header when the key has one,
+        # the stored keys do not, so import a copy which carries the thumbprint
+        key = algorithm.prepare_key(
+            JsonWebKey.import_key(private_key.as_dict(is_private=True), {"kid": kid}),
+        )
+        issuer = tenant.get_issuer()
+        return cls(
+            key=key,
+            kid=kid,
+            algorithm=algorithm,
+            issuer=issuer,
+            protected_header=json_b64encode(header),
+            jwt_config={
+                "key": key,
+                "alg": alg,
+                "iss": issuer,
+                "exp": 3600,
+            },
+            key_set=JsonWebKey.import_key_set(jwks_data),
+            jwks=jwks,
+            jwks_etag=hashlib.sha256(jwks).hexdigest(),
+        )
+
+    def sign(self, payload: dict[str, Any]) -> str:
+        """Return a JWS compact serialization of payload."""
+        payload_segment = urlsafe_b64encode(json_dumps(payload).encode("utf-8"))
+        signing_input = b".".join([self.protected_header, payload_segment])
+        signature = urlsafe_b64encode(self.algorithm.sign(signing_input, self.key))
+        return b".".join([signing_input, signature]).decode("ascii")
+
+    def get_jwt_config(self) -> JwtConfig:
+        """Return the ID token configuration for authlib's OpenID grants.
+
+        authlib adds the audience and nonce to the config it is given,
+        so every caller gets its own copy.
+        """
+        return self.jwt_config.copy()
+
+
+class Keyring:
+    """Signing keys of the ``settings.KEYRING_CACHE_SIZE`` most recently used
+    tenants are kept for ``settings.KEYRING_CACHE_TTL`` seconds.
+
+    Saving a tenant or one of its keys drops them right away in the current
+    process. Other worker processes pick up rotations when their entry
+    expires, which the overlap windows of the rotation allow for.
+    """
+
+    def __init__(self) -> None:
+        self._keys: LRUCache[uuid.UUID, SigningKey] = LRUCache(
+            "keyring",
+            size_setting="KEYRING_CACHE_SIZE",
+            ttl_setting="KEYRING_CACHE_TTL",
+        )
+
+    def get(self, tenant: "Tenant") -> SigningKey:
+        signing_key = self._keys.get(tenant.id)
+        if signing_key is None:
+            signing_key = SigningKey.from_tenant(tenant)
+            self._keys.put(tenant.id, signing_key)
+        return signing_key
+
+    def invalidate(self, tenant_id: uuid.UUID) -> None:
+        self._keys.pop(tenant_id)
+
+    def clear(self) -> None:
+        self._keys.clear()
+
+
+keyring = Keyring()
+
+
+def invalidate_tenant_keys(sender: type, instance: "Tenant", **kwargs: Any) -> None:
+    keyring.invalidate(instance.id)
+
+
+def invalidate_rotated_keys(
+    sender: type,
+    instance: TenantSigningKey,
+    **kwargs: Any,
+) -> None:
+    keyring.invalidate(instance.tenant_id)
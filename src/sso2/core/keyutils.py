@@ -3,12 +3,13 @@ import dataclasses
 import datetime
 import enum
 import ipaddress
-from functools import lru_cache
+import uuid
 from pathlib import Path
 
-from authlib.jose import JsonWebKey, RSAKey
+from authlib.jose import ECKey, JsonWebKey, OKPKey, RSAKey
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ed448, ed25519
 from cryptography.hazmat.primitives.asymmetric.types import (
     CertificateIssuerPrivateKeyTypes,
 )
@@ -16,6 +17,8 @@ from cryptography.x509 import Certificate, Extension, GeneralName
 from cryptography.x509.base import _AllowedHashTypes
 from django.utils import timezone
 
+from sso2.core.lru import LRUCache
+
 key_dir = Path(__file__).parent.parent.parent.parent / "keys"
 
 
@@ -35,29 +38,123 @@ class JwsAlgorithm(enum.StrEnum):
     RS512 = "RS512"
 
 
-@lru_cache
-def get_private_key_from_path(path: str) -> RSAKey:
-    """Return the private key used to sign JWTs."""
-    with (key_dir / path).open() as f:
-        private_key = JsonWebKey.import_key(f.read())
-        if not private_key.private_key:
-            raise AssertionError("Private key is not private")
+TenantKey = RSAKey | ECKey | OKPKey
+
+# Key type and curve or key size to generate for each signing algorithm
+KEY_PARAMETERS: dict[JwsAlgorithm, tuple[str, str | int]] = {
+    JwsAlgorithm.EdDSA: ("OKP", "Ed25519"),
+    JwsAlgorithm.ES256: ("EC", "P-256"),
+    JwsAlgorithm.ES384: ("EC", "P-384"),
+    JwsAlgorithm.ES512: ("EC", "P-521"),
+    JwsAlgorithm.PS256: ("RSA", 2048),
+    JwsAlgorithm.PS384: ("RSA", 2048),
+    JwsAlgorithm.PS512: ("RSA", 2048),
+    JwsAlgorithm.RS256: ("RSA", 2048),
+    JwsAlgorithm.RS384: ("RSA", 2048),
+    JwsAlgorithm.RS512: ("RSA", 2048),
+}
+
+
+def generate_private_key(algorithm: JwsAlgorithm) -> TenantKey:
+    try:
+        kty, crv_or_size = KEY_PARAMETERS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unsupported signing algorithm: {algorithm}") from None
+    return JsonWebKey.generate_key(
+        kty=kty,
+        crv_or_size=crv_or_size,
+        is_private=True,
+    )
+
+
+def get_key_pool_dir(algorithm: JwsAlgorithm) -> Path:
+    """Return the pool directory for algorithm, shared by algorithms that use
+    the same kind of key."""
+    kty, crv_or_size = KEY_PARAMETERS[algorithm]
+    return key_dir / "pool" / f"{kty}-{crv_or_size}"
+
+
+def count_pooled_keys(algorithm: JwsAlgorithm) -> int:
+    pool_dir = get_key_pool_dir(algorithm)
+    if not pool_dir.exists():
+        return 0
+    return sum(1 for path in pool_dir.iterdir() if path.suffix == ".pem")
+
+
+def fill_key_pool(algorithm: JwsAlgorithm, size: int) -> int:
+    """Generate keys until the pool for algorithm holds size keys.
+
+    Keys are written under a temporary name and renamed into place, so
+    take_pooled_key() never sees a partially written file. Returns the
+    number of keys that were generated.
+    """
+    pool_dir = get_key_pool_dir(algorithm)
+    pool_dir.mkdir(parents=True, exist_ok=True)
+    missing = size - count_pooled_keys(algorithm)
+    for _ in range(missing):
+        name = uuid.uuid4().hex
+        tmp_path = pool_dir / f"{name}.tmp"
+        with tmp_path.open("wb") as f:
+            f.write(generate_private_key(algorithm).as_pem(is_private=True))
+        tmp_path.chmod(0o600)
+        tmp_path.rename(pool_dir / f"{name}.pem")
+    return max(missing, 0)
+
+
+def take_pooled_key(algorithm: JwsAlgorithm) -> TenantKey | None:
+    """Remove a pre-generated key from the pool, None if it is empty."""
+    pool_dir = get_key_pool_dir(algorithm)
+    if not pool_dir.exists():
+        return None
+    for path in pool_dir.iterdir():
+        if path.suffix != ".pem":
+            continue
+        # Renaming is atomic, so concurrent callers never get the same key
+        claimed_path = path.with_suffix(f".{uuid.uuid4().hex}.claimed")
+        try:
+            path.rename(claimed_path)
+        except FileNotFoundError:
+            continue
+        with claimed_path.open() as f:
+            private_key = JsonWebKey.import_key(f.read())
+        claimed_path.unlink()
         return private_key
+    return None
+
+
+key_file_cache: LRUCache[str, TenantKey] = LRUCache(
+    "key_files",
+    size_setting="KEY_FILE_CACHE_SIZE",
+)
+
+
+def get_private_key_from_path(path: str) -> TenantKey:
+    """Return the private key used to sign JWTs."""
+    private_key = key_file_cache.get(path)
+    if private_key is None:
+        with (key_dir / path).open() as f:
+            private_key = JsonWebKey.import_key(f.read())
+        key_file_cache.put(path, private_key)
+    if not private_key.private_key:
+        raise AssertionError("Private key is not private")
+    return private_key
 
 
-@lru_cache
-def get_public_key_from_path(path: str) -> RSAKey:
+def get_public_key_from_path(path: str) -> TenantKey:
     """Return the public key used to verify JWTs."""
-    with (key_dir / path).open() as f:
-        public_key = JsonWebKey.import_key(f.read())
-        if public_key.private_key:
-            raise AssertionError("Public key is not public")
-        return public_key
+    public_key = key_file_cache.get(path)
+    if public_key is None:
+        with (key_dir / path).open() as f:
+            public_key = JsonWebKey.import_key(f.read())
+        key_file_cache.put(path, public_key)
+    if public_key.private_key:
+        raise AssertionError("Public key is not public")
+    return public_key
 
 
 @dataclasses.dataclass
 class StoredKey:
-    key: RSAKey
+    key: TenantKey
     path: Path
     private: bool = True
 
@@ -81,12 +178,7 @@ def create_key_pair(
         private_jwk = get_private_key_from_path(str(private_key_path))
         generate_new_key = False
     else:
-        assert algorithm == "RS256"
-        private_jwk = JsonWebKey.generate_key(
-            kty="RSA",
-            crv_or_size=2048,
-            is_private=True,
-        )
+        private_jwk = take_pooled_key(algorithm) or generate_private_key(algorithm)
 
     private = StoredKey(
         key=private_jwk,
@@ -164,6 +256,11 @@ def create_client_certificate(
     algorithm: type[_AllowedHashTypes] = hashes.SHA256,
     valid_days: int = 365,
 ) -> Certificate:
+    # EdDSA keys have a fixed digest and must be signed without one
+    if isinstance(private_key, ed25519.Ed25519PrivateKey | ed448.Ed448PrivateKey):
+        hash_algorithm = None
+    else:
+        hash_algorithm = algorithm()
     utcnow = timezone.now()
     builder = x509.CertificateBuilder()
     builder = builder.issuer_name(
@@ -195,5 +292,5 @@ def create_client_certificate(
         )
     return builder.sign(
         private_key=private_key,
-        algorithm=algorithm(),
+        algorithm=hash_algorithm,
     )
@@ -0,0 +1,157 @@
+"""Token bucket throttling of password logins.
+
+Every password check first takes a token from the buckets of the username,
+the client IP and the OAuth2 client it comes from. A bucket holds up to
+``capacity`` tokens and gains ``capacity / period`` tokens per second, as
+configured in ``settings.LOGIN_THROTTLE_RATES``. A login is refused before
+any password is hashed when one of its buckets is empty.
+
+The buckets are kept in a SQLite file at ``settings.LOGIN_THROTTLE_PATH``, so
+all worker processes on a node share them without an external service.
+"""
+import math
+import sqlite3
+import threading
+import time
+import uuid
+from http import HTTPStatus
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpRequest
+
+# Buckets which have been full for a while hold no information, they are
+# deleted every this many checks
+PRUNE_INTERVAL = 1000
+
+
+class LoginThrottledError(Exception):
+    status = HTTPStatus.TOO_MANY_REQUESTS
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"Too many login attempts, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class TokenBucketStore:
+    """Token buckets in a SQLite database shared between processes."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = threading.local()
+        self.checks = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections may not be shared between threads
+        connection: sqlite3.Connection | None = getattr(self._local, "db", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=5,
+                isolation_level=None,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS bucket ("
+                " key TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " updated_at REAL NOT NULL)",
+            )
+            self._local.db = connection
+        return connection
+
+    def take(self, buckets: dict[str, tuple[int, float]]) -> float:
+        """Take a token from each bucket, given as key: (capacity, period).
+
+        Either every bucket gives a token or none does. Returns 0 on success,
+        otherwise the seconds until all of them have a token again.
+        """
+        connection = self._connect()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            placeholders = ",".join("?" * len(buckets))
+            rows = connection.execute(
+                "SELECT key, tokens, updated_at FROM bucket "  # noqa: S608
+                f"WHERE key IN ({placeholders})",
+                list(buckets),
+            )
+            stored = {key: (tokens, updated_at) for key, tokens, updated_at in rows}
+            available = {}
+            wait = 0.0
+            for key, (capacity, period) in buckets.items():
+                rate = capacity / period
+                tokens, updated_at = stored.get(key, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated_at) * rate)
+                available[key] = tokens
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / rate)
+            if not wait:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO bucket VALUES (?, ?, ?)",
+                    [(key, tokens - 1, now) for key, tokens in available.items()],
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self.checks += 1
+        return wait
+
+    def prune(self, max_period: float) -> None:
+        """Delete buckets that have been refilled completely."""
+        self._connect().execute(
+            "DELETE FROM bucket WHERE updated_at < ?",
+            (time.time() - max_period,),
+        )
+
+    def reset(self) -> None:
+        self._connect().execute("DELETE FROM bucket")
+
+
+_stores: dict[Path, TokenBucketStore] = {}
+
+
+def get_bucket_store() -> TokenBucketStore:
+    path = Path(settings.LOGIN_THROTTLE_PATH)
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = TokenBucketStore(path)
+    return store
+
+
+def get_client_ip(request: object) -> str | None:
+    """The address a login came from, None when not made over HTTP."""
+    if not isinstance(request, HttpRequest):
+        return None
+    return request.META.get("REMOTE_ADDR")
+
+
+def throttle_login(
+    *,
+    tenant_id: uuid.UUID | None,
+    username: str | None = None,
+    ip: str | None = None,
+    client_id: str | None = None,
+) -> None:
+    """Take a login attempt from the buckets of everything given.
+
+    Raises LoginThrottledError when one of them is empty.
+    """
+    rates = settings.LOGIN_THROTTLE_RATES
+    buckets = {}
+    if username:
+        buckets[f"user:{tenant_id}:{username.lower()}"] = rates["user"]
+    if ip:
+        buckets[f"ip:{tenant_id}:{ip}"] = rates["ip"]
+    if client_id:
+        buckets[f"client:{client_id}"] = rates["client"]
+    if not buckets:
+        return
+    store = get_bucket_store()
+    wait = store.take(buckets)
+    if store.checks % PRUNE_INTERVAL == 0:
+        store.prune(max(period for _, period in rates.values()))
+    if wait:
+        raise LoginThrottledError(retry_after=math.ceil(wait))
@@ -0,0 +1,113 @@
+"""Size bounded LRU caches with hit, miss and eviction counters.
+
+Every cache registers itself by name, get_cache_stats() returns the
+counters of all of them for the metrics endpoint.
+"""
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+from django.conf import settings
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheStats:
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_ratio: float
+
+
+class LRUCache(Generic[K, V]):
+    """An LRU cache sized by a setting, with an optional time to live.
+
+    The setting names are looked up on every insert, so tests and
+    deployments can change them without recreating the cache.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        size_setting: str,
+        ttl_setting: str | None = None,
+    ) -> None:
+        self.name = name
+        self.size_setting = size_setting
+        self.ttl_setting = ttl_setting
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        caches[name] = self
+
+    @property
+    def maxsize(self) -> int:
+        return int(getattr(settings, self.size_setting))
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: K, value: V) -> None:
+        expires_at = float("inf")
+        if self.ttl_setting is not None:
+            expires_at = time.monotonic() + getattr(settings, self.ttl_setting)
+        maxsize = self.maxsize
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key: K, factory: Callable[[], V]) -> V:
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> CacheStats:
+        lookups = self.hits + self.misses
+        return CacheStats(
+            size=len(self._entries),
+            maxsize=self.maxsize,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            hit_ratio=self.hits / lookups if lookups else 0.0,
+        )
+
+
+caches: dict[str, LRUCache] = {}  # type: ignore[type-arg]
+
+
+def get_cache_stats() -> dict[str, CacheStats]:
+    return {name: cache.stats() for name, cache in caches.items()}
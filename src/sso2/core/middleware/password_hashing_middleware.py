@@ -0,0 +1,37 @@
+from collections.abc import Callable
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from sso2.core.login_throttle import LoginThrottledError
+from sso2.core.password_hashing import PasswordHashingBusyError
+
+
+class PasswordHashingMiddleware:
+    """Answers requests refused by the login throttle or the password
+    hashing pool with a 429 or 503, so that clients back off and retry."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        return self.get_response(request)
+
+    def process_exception(
+        self,
+        request: HttpRequest,
+        exception: Exception,
+    ) -> HttpResponse | None:
+        if isinstance(exception, LoginThrottledError):
+            retry_after = exception.retry_after
+        elif isinstance(exception, PasswordHashingBusyError):
+            retry_after = settings.PASSWORD_HASH_RETRY_AFTER
+        else:
+            return None
+        response = HttpResponse(
+            "Too many login attempts, try again shortly.",
+            content_type="text/plain",
+            status=exception.status,
+        )
+        response["Retry-After"] = str(retry_after)
+        return response
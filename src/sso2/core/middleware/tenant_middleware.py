@@ -2,7 +2,7 @@ from collections.abc import Callable
 
 from django.http import HttpRequest, HttpResponse
 
-from sso2.core.models import Tenant
+from sso2.core.tenant_cache import tenant_cache
 from sso2.core.types import HttpRequestWithUser
 
 
@@ -13,13 +13,10 @@ class TenantMiddleware:
     def __call__(self, request: HttpRequestWithUser) -> HttpResponse:
         tenant_name = request.headers.get("X-Tenant")
         if tenant_name is None:
-            tenant_name = request.headers.get("HOST", "").rsplit(".", 2)[0]
+            tenant = tenant_cache.get_by_host(request.headers.get("HOST", ""))
+        else:
+            tenant = tenant_cache.get_by_name(tenant_name)
 
-        if tenant_name is not None:
-            try:
-                tenant = Tenant.objects.get(name=tenant_name)
-            except Tenant.DoesNotExist:
-                pass
-            else:
-                request.tenant = tenant
+        if tenant is not None:
+            request.tenant = tenant
         return self.get_response(request)
@@ -0,0 +1,73 @@
+import pytest
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+from pytest_django.fixtures import SettingsWrapper
+
+from sso2.core.lru import caches
+from sso2.core.middleware.tenant_middleware import TenantMiddleware
+from sso2.core.models import Tenant
+from sso2.core.tenant_cache import tenant_cache
+from sso2.core.types import AssertNumQueries
+
+
+def get_response(request: HttpRequest) -> HttpResponse:
+    return HttpResponse()
+
+
+@pytest.mark.django_db
+def test_tenant_middleware(
+    tenant: Tenant,
+    django_assert_num_queries: AssertNumQueries,
+) -> None:
+    tenant_cache.clear()
+    middleware = TenantMiddleware(get_response)
+    factory = RequestFactory()
+
+    request = factory.get("/", HTTP_HOST="test.i-1.app")
+    with django_assert_num_queries(1):
+        middleware(request)
+    assert request.tenant == tenant
+
+    request = factory.get("/", HTTP_HOST="test.i-1.app")
+    with django_assert_num_queries(0):
+        middleware(request)
+        middleware(factory.get("/", HTTP_X_TENANT="test"))
+        assert tenant_cache.get_by_id(tenant.id) == tenant
+    assert request.tenant == tenant
+
+    request = factory.get("/", HTTP_HOST="missing.i-1.app")
+    with django_assert_num_queries(1):
+        middleware(request)
+        middleware(request)
+    assert not hasattr(request, "tenant")
+
+
+@pytest.mark.django_db
+def test_tenant_cache_invalidated_on_save(tenant: Tenant) -> None:
+    tenant_cache.clear()
+    assert tenant_cache.get_by_host("renamed.i-1.app") is None
+    cached = tenant_cache.get_by_name("test")
+    assert cached is not None
+
+    cached.name = "renamed"
+    cached.save()
+    try:
+        assert tenant_cache.get_by_name("test") is None
+        assert tenant_cache.get_by_host("renamed.i-1.app") == tenant
+    finally:
+        cached.name = "test"
+        cached.save()
+    assert tenant_cache.get_by_name("test") == tenant
+
+
+@pytest.mark.django_db
+def test_tenant_cache_bounds_unknown_names(settings: SettingsWrapper) -> None:
+    settings.TENANT_CACHE_MISS_SIZE = 10
+    tenant_cache.clear()
+    middleware = TenantMiddleware(get_response)
+    factory = RequestFactory()
+    for i in range(100):
+        middleware(factory.get("/", HTTP_X_TENANT=f"junk-{i}"))
+        middleware(factory.get("/", HTTP_HOST=f"junk-{i}.i-1.app"))
+    assert caches["tenant_misses"].stats().size == settings.TENANT_CACHE_MISS_SIZE
+    assert caches["tenants"].stats().size == 0
@@ -0,0 +1,63 @@
+# Generated by Django 4.2 on 2026-10-18 14:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0023_revokedtoken"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TenantSigningKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("kid", models.TextField(unique=True)),
+                ("algorithm", models.TextField()),
+                ("public_key_path", models.TextField()),
+                ("private_key_path", models.TextField()),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[
+                            ("next", "Next"),
+                            ("active", "Active"),
+                            ("retiring", "Retiring"),
+                            ("retired", "Retired"),
+                        ],
+                        db_index=True,
+                        default="next",
+                        max_length=16,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "state_changed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="signing_keys",
+                        to="core.tenant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Tenant Signing Key",
+                "verbose_name_plural": "Tenant Signing Keys",
+            },
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 4.2 on 2026-10-18 15:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0024_tenantsigningkey"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CacheGeneration",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=64, unique=True)),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="EncryptedKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("kid", models.TextField(unique=True)),
+                ("algorithm", models.TextField()),
+                ("public_key_pem", models.TextField()),
+                ("encrypted_private_key", models.BinaryField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Encrypted Key",
+                "verbose_name_plural": "Encrypted Keys",
+            },
+        ),
+        migrations.AlterField(
+            model_name="tenant",
+            name="private_key_path",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name="tenant",
+            name="public_key_path",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name="tenantsigningkey",
+            name="private_key_path",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name="tenantsigningkey",
+            name="public_key_path",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="tenant",
+            name="key",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="core.encryptedkey",
+            ),
+        ),
+        migrations.AddField(
+            model_name="tenantsigningkey",
+            name="key",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="core.encryptedkey",
+            ),
+        ),
+    ]
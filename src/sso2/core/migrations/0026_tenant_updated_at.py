@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-18 17:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0025_encryptedkey"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tenant",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -1,4 +1,15 @@
+from sso2.core.models.cache_generation_model import CacheGeneration
+from sso2.core.models.encrypted_key_model import EncryptedKey
+from sso2.core.models.revoked_token_model import RevokedToken
 from sso2.core.models.tenant_model import Tenant
+from sso2.core.models.tenant_signing_key_model import TenantSigningKey
 from sso2.core.models.user_model import User
 
-__all__ = ["Tenant", "User"]
+__all__ = [
+    "CacheGeneration",
+    "EncryptedKey",
+    "RevokedToken",
+    "Tenant",
+    "TenantSigningKey",
+    "User",
+]
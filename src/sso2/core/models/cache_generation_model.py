@@ -0,0 +1,26 @@
+from django.db.models import BigIntegerField, CharField, F, Model
+
+
+class CacheGeneration(Model):
+    """A counter per in-memory cache, bumped whenever its data changes.
+
+    Signals only reach the worker process that made a change, other workers
+    poll the counter and drop their cache when it has moved.
+    """
+
+    name = CharField(max_length=64, unique=True)
+    value = BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.value}"
+
+    @classmethod
+    def bump(cls, name: str) -> None:
+        updated = cls.objects.filter(name=name).update(value=F("value") + 1)
+        if not updated:
+            cls.objects.get_or_create(name=name, defaults={"value": 1})
+
+    @classmethod
+    def current(cls, name: str) -> int:
+        value = cls.objects.filter(name=name).values_list("value", flat=True).first()
+        return value or 0
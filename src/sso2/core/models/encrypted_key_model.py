@@ -0,0 +1,44 @@
+from typing import Self
+
+from authlib.jose import JsonWebKey
+from django.db.models import BinaryField, DateTimeField, Model, TextField
+
+from sso2.core.keyutils import TenantKey
+
+
+class EncryptedKey(Model):
+    """A private signing key, encrypted with settings.KEY_ENCRYPTION_KEYS.
+
+    Keys are looked up through :mod:`sso2.core.key_store`, which keeps the
+    decrypted keys in memory.
+    """
+
+    class Meta:
+        verbose_name = "Encrypted Key"
+        verbose_name_plural = "Encrypted Keys"
+
+    kid = TextField(unique=True)
+    algorithm = TextField()
+    public_key_pem = TextField()
+    encrypted_private_key = BinaryField()
+    created_at = DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return self.kid
+
+    @classmethod
+    def store(cls, private_key: TenantKey, algorithm: str) -> Self:
+        from sso2.core.key_store import encrypt_private_key
+
+        key, _ = cls.objects.get_or_create(
+            kid=private_key.thumbprint(),
+            defaults={
+                "algorithm": algorithm,
+                "public_key_pem": private_key.as_pem(is_private=False).decode(),
+                "encrypted_private_key": encrypt_private_key(private_key),
+            },
+        )
+        return key
+
+    def get_public_key(self) -> TenantKey:
+        return JsonWebKey.import_key(self.public_key_pem)
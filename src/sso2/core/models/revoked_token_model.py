@@ -0,0 +1,44 @@
+from typing import TYPE_CHECKING
+
+from django.db.models import CASCADE, CharField, ForeignKey, IntegerField, Model
+
+from sso2.core.timeutils import now_timestamp
+
+if TYPE_CHECKING:
+    from sso2.core.models import Tenant
+
+
+class RevokedToken(Model):
+    """Deny list of revoked JWT access tokens, keyed by their jti claim.
+
+    Access tokens are verified from their signature without a database row
+    that could be flagged as revoked, so revocation records the jti until
+    the token expires. See :mod:`sso2.core.revoked_tokens`.
+    """
+
+    class Meta:
+        verbose_name = "Revoked Token"
+        verbose_name_plural = "Revoked Tokens"
+
+    tenant = ForeignKey("core.Tenant", on_delete=CASCADE)
+    jti = CharField(max_length=64, unique=True)
+    expires_at = IntegerField(db_index=True)
+
+    @classmethod
+    def revoke(cls, *, tenant: "Tenant", jti: str, expires_at: int) -> None:
+        # Revocations are rare, pruning here keeps the list to the tokens
+        # which have not expired yet without a scheduled job
+        cls.delete_expired()
+        cls.objects.get_or_create(
+            jti=jti,
+            defaults={"tenant": tenant, "expires_at": expires_at},
+        )
+
+    @classmethod
+    def is_revoked(cls, jti: str) -> bool:
+        return cls.objects.filter(jti=jti).exists()
+
+    @classmethod
+    def delete_expired(cls) -> int:
+        deleted, _ = cls.objects.filter(expires_at__lt=now_timestamp()).delete()
+        return deleted
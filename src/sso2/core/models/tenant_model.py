@@ -1,24 +1,49 @@
 import socket
 import uuid
+from collections.abc import Iterable
+from functools import lru_cache
 
-from authlib.jose import RSAKey
 from cryptography import x509
 from cryptography.hazmat.primitives.serialization import Encoding
 from cryptography.x509 import Certificate
 from django.conf import settings
-from django.core.exceptions import ValidationError
-from django.db.models import Model, TextField, UUIDField
+from django.db.models import (
+    PROTECT,
+    DateTimeField,
+    ForeignKey,
+    Model,
+    Q,
+    TextField,
+    UUIDField,
+)
 from django.http import Http404
 
+from sso2.core.key_store import create_signing_key, key_store
 from sso2.core.keyutils import (
     JwsAlgorithm,
+    TenantKey,
     create_client_certificate,
-    create_key_pair,
     get_private_key_from_path,
     get_public_key_from_path,
 )
 
 
+def parse_tenant_id(identifier: str | uuid.UUID) -> uuid.UUID | None:
+    """Return identifier as a tenant id, or None if it is a tenant name."""
+    if isinstance(identifier, uuid.UUID):
+        return identifier
+    try:
+        return uuid.UUID(identifier)
+    except ValueError:
+        return None
+
+
+@lru_cache
+def get_host_ip(hostname: str) -> str:
+    """Resolve hostname once per process, every tenant certificate uses it."""
+    return socket.gethostbyname(hostname)
+
+
 def get_tenant_issuer(tenant_name: str) -> str:
     return f"https://{tenant_name}.{settings.APP_DOMAIN_NAME}/"
 
@@ -32,11 +57,20 @@ class Tenant(Model):
         verbose_name="ID",
     )
     name = TextField(unique=True)
-    public_key_path = TextField()
-    private_key_path = TextField()
+    # Keys are either stored in the database or as files, see key_store
+    key = ForeignKey(
+        "core.EncryptedKey",
+        on_delete=PROTECT,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    public_key_path = TextField(blank=True)
+    private_key_path = TextField(blank=True)
     certificate_pem = TextField()
     algorithm = TextField()
     display_name = TextField()
+    updated_at = DateTimeField(auto_now=True)
 
     @property
     def host(self) -> str:
@@ -48,16 +82,16 @@ class Tenant(Model):
         name: str = "demo",
         algorithm: JwsAlgorithm = JwsAlgorithm.RS256,
     ) -> "Tenant":
-        public_key, private_key = create_key_pair(basename=name, algorithm=algorithm)
+        new_key = create_signing_key(basename=name, algorithm=algorithm)
         tenant_issuer_url = get_tenant_issuer(tenant_name=name)
         domain_name = settings.APP_DOMAIN_NAME
         certificate_pem = (
             create_client_certificate(
                 issuer_name=tenant_issuer_url,
-                private_key=private_key.key.private_key,
+                private_key=new_key.private_key.private_key,
                 tls_client_auth_san_dns=domain_name,
                 tls_client_auth_san_uri=tenant_issuer_url,
-                tls_client_auth_san_ip=socket.gethostbyname(domain_name),
+                tls_client_auth_san_ip=get_host_ip(domain_name),
                 tls_client_auth_san_email=f"admin@{domain_name}",
                 tls_client_auth_subject_dn=f"CN={domain_name}",
             )
@@ -67,30 +101,73 @@ class Tenant(Model):
 
         tenant = Tenant(
             name=name,
-            public_key_path=str(public_key.path),
-            private_key_path=str(private_key.path),
+            key=new_key.stored,
+            public_key_path=new_key.public_key_path,
+            private_key_path=new_key.private_key_path,
             certificate_pem=certificate_pem,
             algorithm=algorithm,
         )
         return tenant
 
     @classmethod
-    def get_or_404(cls, *, tenant_id: str) -> "Tenant":
-        try:
-            return cls.objects.get(pk=tenant_id)
-        except (Tenant.DoesNotExist, ValueError, ValidationError):
-            try:
-                return cls.objects.get(name=tenant_id)
-            except Tenant.DoesNotExist as e:
-                raise Http404 from e
+    def get_or_404(cls, *, tenant_id: str | uuid.UUID) -> "Tenant":
+        """Look up a tenant by id or name, tenant_id can be either."""
+        from sso2.core.tenant_cache import tenant_cache
+
+        tenant = tenant_cache.get(tenant_id)
+        if tenant is None:
+            raise Http404
+        return tenant
+
+    @classmethod
+    def resolve_many(
+        cls,
+        identifiers: Iterable[str | uuid.UUID],
+    ) -> dict[str | uuid.UUID, "Tenant"]:
+        """Look up tenants by id or name with a single query.
+
+        Returns a mapping from each identifier that was found to its tenant.
+        """
+        identifiers = list(identifiers)
+        ids: set[uuid.UUID] = set()
+        # UUID-shaped strings are tried as names too, like get_or_404() does
+        names: set[str] = set()
+        for identifier in identifiers:
+            tenant_id = parse_tenant_id(identifier)
+            if tenant_id is not None:
+                ids.add(tenant_id)
+            if not isinstance(identifier, uuid.UUID):
+                names.add(identifier)
+        if not ids and not names:
+            return {}
+
+        by_id: dict[uuid.UUID, Tenant] = {}
+        by_name: dict[str, Tenant] = {}
+        for tenant in cls.objects.filter(Q(pk__in=ids) | Q(name__in=names)):
+            by_id[tenant.id] = tenant
+            by_name[tenant.name] = tenant
+
+        resolved: dict[str | uuid.UUID, Tenant] = {}
+        for identifier in identifiers:
+            tenant_id = parse_tenant_id(identifier)
+            tenant = by_id.get(tenant_id) if tenant_id is not None else None
+            if tenant is None and not isinstance(identifier, uuid.UUID):
+                tenant = by_name.get(identifier)
+            if tenant is not None:
+                resolved[identifier] = tenant
+        return resolved
 
     def get_issuer(self) -> str:
         return f"https://{self.host}/"
 
-    def get_private_key(self) -> RSAKey:
+    def get_private_key(self) -> TenantKey:
+        if self.key_id is not None:
+            return key_store.get_private_key(self.key_id)
         return get_private_key_from_path(self.private_key_path)
 
-    def get_public_key(self) -> RSAKey:
+    def get_public_key(self) -> TenantKey:
+        if self.key_id is not None:
+            return key_store.get_public_key(self.key_id)
         return get_public_key_from_path(self.public_key_path)
 
     def get_certificate(self) -> Certificate:
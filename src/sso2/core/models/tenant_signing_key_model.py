@@ -0,0 +1,142 @@
+import datetime
+import uuid
+from typing import TYPE_CHECKING, Self
+
+from django.db.models import (
+    CASCADE,
+    PROTECT,
+    CharField,
+    DateTimeField,
+    ForeignKey,
+    Model,
+    TextChoices,
+    TextField,
+)
+from django.utils import timezone
+
+from sso2.core.key_store import create_signing_key, key_store
+from sso2.core.keyutils import (
+    JwsAlgorithm,
+    TenantKey,
+    get_private_key_from_path,
+    get_public_key_from_path,
+)
+
+if TYPE_CHECKING:
+    from sso2.core.models import Tenant
+
+
+class SigningKeyState(TextChoices):
+    NEXT = "next"
+    ACTIVE = "active"
+    RETIRING = "retiring"
+    RETIRED = "retired"
+
+
+# Keys that are listed in the tenant's JWKS
+PUBLISHED_STATES = [
+    SigningKeyState.NEXT,
+    SigningKeyState.ACTIVE,
+    SigningKeyState.RETIRING,
+]
+
+
+class TenantSigningKey(Model):
+    """A tenant signing key and where it is in its rotation.
+
+    A key is published in the JWKS as ``next`` before it signs anything, so
+    resource servers already have it cached when it becomes ``active``.
+    Once replaced it stays published as ``retiring`` until the tokens it
+    signed have expired, and is then ``retired``.
+    """
+
+    class Meta:
+        verbose_name = "Tenant Signing Key"
+        verbose_name_plural = "Tenant Signing Keys"
+
+    tenant = ForeignKey("core.Tenant", on_delete=CASCADE, related_name="signing_keys")
+    kid = TextField(unique=True)
+    algorithm = TextField()
+    key = ForeignKey(
+        "core.EncryptedKey",
+        on_delete=PROTECT,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    public_key_path = TextField(blank=True)
+    private_key_path = TextField(blank=True)
+    state = CharField(
+        max_length=16,
+        choices=SigningKeyState.choices,
+        default=SigningKeyState.NEXT,
+        db_index=True,
+    )
+    created_at = DateTimeField(auto_now_add=True)
+    state_changed_at = DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:
+        return self.kid
+
+    @classmethod
+    def generate(
+        cls,
+        *,
+        tenant: "Tenant",
+        state: SigningKeyState = SigningKeyState.NEXT,
+        now: datetime.datetime | None = None,
+    ) -> Self:
+        algorithm = JwsAlgorithm(tenant.algorithm)
+        new_key = create_signing_key(
+            basename=f"{tenant.name}-{uuid.uuid4().hex}",
+            algorithm=algorithm,
+        )
+        return cls.objects.create(
+            tenant=tenant,
+            kid=new_key.private_key.thumbprint(),
+            algorithm=algorithm,
+            key=new_key.stored,
+            public_key_path=new_key.public_key_path,
+            private_key_path=new_key.private_key_path,
+            state=state,
+            state_changed_at=now or timezone.now(),
+        )
+
+    @classmethod
+    def adopt_tenant_key(
+        cls,
+        tenant: "Tenant",
+        *,
+        now: datetime.datetime | None = None,
+    ) -> Self:
+        """Record the key the tenant was created with as its active key."""
+        return cls.objects.create(
+            tenant=tenant,
+            kid=tenant.get_private_key().thumbprint(),
+            algorithm=tenant.algorithm,
+            key_id=tenant.key_id,
+            public_key_path=tenant.public_key_path,
+            private_key_path=tenant.private_key_path,
+            state=SigningKeyState.ACTIVE,
+            state_changed_at=now or timezone.now(),
+        )
+
+    def set_state(
+        self,
+        state: SigningKeyState,
+        *,
+        now: datetime.datetime | None = None,
+    ) -> None:
+        self.state = state
+        self.state_changed_at = now or timezone.now()
+        self.save(update_fields=["state", "state_changed_at"])
+
+    def get_private_key(self) -> TenantKey:
+        if self.key_id is not None:
+            return key_store.get_private_key(self.key_id)
+        return get_private_key_from_path(self.private_key_path)
+
+    def get_public_key(self) -> TenantKey:
+        if self.key_id is not None:
+            return key_store.get_public_key(self.key_id)
+        return get_public_key_from_path(self.public_key_path)
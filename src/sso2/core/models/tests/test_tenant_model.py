@@ -1,10 +1,14 @@
 import socket
+import uuid
 
+import pytest
 from cryptography.x509 import Certificate
 from django.conf import settings
+from django.http import Http404
 
 from sso2.core.keyutils import parse_client_certificate
 from sso2.core.models import Tenant
+from sso2.core.tenant_cache import tenant_cache
 
 
 def test_tenant(tenant: Tenant) -> None:
@@ -22,3 +26,39 @@ def test_tenant(tenant: Tenant) -> None:
     assert cc.tls_client_auth_san_uri == tenant.get_issuer()
     assert cc.tls_client_auth_san_email == f"admin@{settings.APP_DOMAIN_NAME}"
     assert cc.tls_client_auth_subject_dn == f"CN={settings.APP_DOMAIN_NAME}"
+
+
+@pytest.mark.django_db
+def test_tenant_get_or_404(tenant: Tenant) -> None:
+    tenant_cache.clear()
+    assert Tenant.get_or_404(tenant_id="test") == tenant
+    assert Tenant.get_or_404(tenant_id=str(tenant.id)) == tenant
+    assert Tenant.get_or_404(tenant_id=tenant.id) == tenant
+    with pytest.raises(Http404):
+        Tenant.get_or_404(tenant_id="missing")
+    with pytest.raises(Http404):
+        Tenant.get_or_404(tenant_id=str(uuid.uuid4()))
+
+
+@pytest.mark.django_db
+def test_tenant_resolve_many(tenant: Tenant) -> None:
+    assert Tenant.resolve_many([]) == {}
+    missing = str(uuid.uuid4())
+    resolved = Tenant.resolve_many(["test", str(tenant.id), tenant.id, missing])
+    assert resolved == {"test": tenant, str(tenant.id): tenant, tenant.id: tenant}
+
+
+@pytest.mark.django_db
+def test_tenant_with_uuid_shaped_name(tenant: Tenant) -> None:
+    tenant_cache.clear()
+    name = str(uuid.uuid4())
+    other = Tenant.create_example(name=name)
+    other.save()
+    assert Tenant.get_or_404(tenant_id=name) == other
+    assert Tenant.get_or_404(tenant_id=str(tenant.id)) == tenant
+    with pytest.raises(Http404):
+        Tenant.get_or_404(tenant_id=uuid.UUID(name))
+    assert Tenant.resolve_many([name, str(tenant.id)]) == {
+        name: other,
+        str(tenant.id): tenant,
+    }
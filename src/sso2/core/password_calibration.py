@@ -0,0 +1,128 @@
+"""Measure what Argon2 parameters cost on the current machine.
+
+Used by ``ssotool passwords calibrate`` to pick the most expensive parameters
+that still answer logins within a latency target at the expected login rate.
+"""
+import dataclasses
+import os
+import statistics
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+import argon2
+
+PASSWORD = "correct horse battery staple"  # noqa: S105
+
+
+@dataclasses.dataclass(frozen=True)
+class Argon2Parameters:
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+
+    def hasher(self) -> argon2.PasswordHasher:
+        return argon2.PasswordHasher(
+            time_cost=self.time_cost,
+            memory_cost=self.memory_cost,
+            parallelism=self.parallelism,
+            type=argon2.Type.ID,
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class Measurement:
+    parameters: Argon2Parameters
+    # Seconds a single verification takes
+    mean: float
+    p99: float
+    # CPU seconds a verification uses, over all of argon2's threads
+    cpu_seconds: float
+
+    @property
+    def per_core_throughput(self) -> float:
+        """Verifications per second a single core can do."""
+        return 1 / self.cpu_seconds
+
+    def utilization(self, logins_per_second: float, cores: int) -> float:
+        """Share of the cores verifying logins_per_second takes."""
+        return logins_per_second * self.cpu_seconds / cores
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure(parameters: Argon2Parameters, samples: int) -> Measurement:
+    hasher = parameters.hasher()
+    encoded = hasher.hash(PASSWORD)
+    timings = []
+    cpu_start = time.process_time()
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.verify(encoded, PASSWORD)
+        timings.append(time.perf_counter() - start)
+    cpu_seconds = (time.process_time() - cpu_start) / samples
+    return Measurement(
+        parameters=parameters,
+        mean=statistics.fmean(timings),
+        p99=percentile(timings, 0.99),
+        cpu_seconds=max(cpu_seconds, 1e-9),
+    )
+
+
+def simulate_logins(
+    parameters: Argon2Parameters,
+    *,
+    logins_per_second: float,
+    duration: float,
+    workers: int,
+) -> float:
+    """Verify at a steady rate on workers threads, like the hashing pool does,
+    and return the p99 latency including the time spent waiting."""
+    hasher = parameters.hasher()
+    encoded = hasher.hash(PASSWORD)
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def verify(arrival: float) -> None:
+        hasher.verify(encoded, PASSWORD)
+        with lock:
+            latencies.append(time.perf_counter() - arrival)
+
+    interval = 1 / logins_per_second
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        start = time.perf_counter()
+        for i in range(max(1, int(duration * logins_per_second))):
+            arrival = start + i * interval
+            time.sleep(max(0.0, arrival - time.perf_counter()))
+            executor.submit(verify, arrival)
+    return percentile(latencies, 0.99)
+
+
+def calibrate(
+    candidates: Iterable[Argon2Parameters],
+    *,
+    target_latency: float,
+    logins_per_second: float,
+    samples: int,
+    cores: int | None = None,
+    max_utilization: float = 0.5,
+) -> tuple[Argon2Parameters | None, list[Measurement]]:
+    """Measure every candidate and return the most expensive one whose p99
+    stays within target_latency and which verifies logins_per_second with at
+    most max_utilization of the cores, together with all measurements."""
+    cores = cores or os.cpu_count() or 1
+    measurements = [measure(parameters, samples) for parameters in candidates]
+    acceptable = [
+        measurement
+        for measurement in measurements
+        if measurement.p99 <= target_latency
+        and measurement.utilization(logins_per_second, cores) <= max_utilization
+    ]
+    if not acceptable:
+        return None, measurements
+    best = max(acceptable, key=lambda measurement: measurement.cpu_seconds)
+    return best.parameters, measurements
@@ -0,0 +1,161 @@
+"""Password hashing on a bounded pool of worker threads.
+
+Argon2 is made to be slow and to use a lot of memory, a burst of logins
+hashing on the request threads can occupy every core and stall the requests
+which do no hashing at all. Hashes are instead run by at most
+``settings.PASSWORD_HASH_WORKERS`` threads per process (argon2 releases the
+GIL while hashing). At most ``settings.PASSWORD_HASH_QUEUE_SIZE`` more can be
+waiting for a thread and a single tenant can have at most
+``settings.PASSWORD_HASH_TENANT_LIMIT`` hashes running or waiting, anything
+beyond that is refused right away instead of piling up.
+"""
+import threading
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.crypto import get_random_string
+
+if TYPE_CHECKING:
+    from sso2.core.models import User
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class PasswordHashingBusyError(Exception):
+    """Every hashing thread is busy and the queue is full."""
+
+    status = HTTPStatus.SERVICE_UNAVAILABLE
+
+
+class TenantPasswordHashingLimitError(PasswordHashingBusyError):
+    """The tenant already has its share of the hashing threads."""
+
+    status = HTTPStatus.TOO_MANY_REQUESTS
+
+
+class PasswordHashingPool:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = 0
+        self._pending_by_tenant: Counter[str] = Counter()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use so that each forked worker process starts its
+        # own threads
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hashing",
+            )
+        return self._executor
+
+    def _admit(self, key: str) -> None:
+        capacity = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE
+        with self._lock:
+            if self._pending >= capacity:
+                raise PasswordHashingBusyError
+            if self._pending_by_tenant[key] >= settings.PASSWORD_HASH_TENANT_LIMIT:
+                raise TenantPasswordHashingLimitError
+            self._pending += 1
+            self._pending_by_tenant[key] += 1
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._pending_by_tenant[key] -= 1
+            if not self._pending_by_tenant[key]:
+                del self._pending_by_tenant[key]
+
+    def run(
+        self,
+        tenant_id: uuid.UUID | None,
+        fn: Callable[P, T],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> T:
+        """Run fn on a hashing thread and wait for its result.
+
+        Raises PasswordHashingBusyError if the pool or the tenant's share
+        of it is full.
+        """
+        key = "" if tenant_id is None else str(tenant_id)
+        self._admit(key)
+        try:
+            return self._get_executor().submit(fn, *args, **kwargs).result()
+        finally:
+            self._release(key)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+password_hashing_pool = PasswordHashingPool()
+
+
+def check_password(user: "User", password: str) -> bool:
+    """User.check_password(), with the hashing done on the pool.
+
+    Unlike User.check_password() the upgraded hash of an outdated password
+    is saved from the calling thread, so no database connection is opened
+    from the hashing threads.
+    """
+    outdated: list[str] = []
+    is_correct = password_hashing_pool.run(
+        user.tenant_id,
+        hashers.check_password,
+        password,
+        user.password,
+        setter=outdated.append,
+    )
+    if is_correct and outdated:
+        user.password = password_hashing_pool.run(
+            user.tenant_id,
+            hashers.make_password,
+            password,
+        )
+        user.save(update_fields=["password"])
+    return is_correct
+
+
+def _hasher_parameters(hasher: hashers.BasePasswordHasher) -> tuple[Any, ...]:
+    return (
+        hasher.algorithm,
+        *(
+            getattr(hasher, name, None)
+            for name in ("time_cost", "memory_cost", "parallelism", "iterations")
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_dummy_hash(parameters: tuple[Any, ...]) -> str:
+    return hashers.make_password(get_random_string(32))
+
+
+def get_dummy_hash() -> str:
+    """A hash of a random password with the current default hasher, made
+    once per process and again whenever the hasher's parameters change."""
+    return _get_dummy_hash(_hasher_parameters(hashers.get_hasher()))
+
+
+def check_dummy_password(tenant_id: uuid.UUID | None, password: str) -> None:
+    """Spend the time check_password() takes for an existing user.
+
+    Called by every password entry point when there is no user, so that the
+    response time does not tell whether the user exists. Verifying against
+    a precomputed hash costs the same as verifying a stored one, without
+    generating a salt and hashing a new password.
+    """
+    hasher = hashers.get_hasher()
+    password_hashing_pool.run(tenant_id, hasher.verify, password, get_dummy_hash())
@@ -0,0 +1,89 @@
+"""In-process copy of the RevokedToken deny list.
+
+Checking every API request's, introspection's and userinfo call's jti
+against the database would add a query to each of them. Instead each worker
+keeps the unexpired revoked jtis of each tenant in memory, loaded when the
+worker starts (see :mod:`sso2.core.warmup`), and reloads the unexpired rows
+at most every ``settings.REVOKED_TOKEN_POLL_INTERVAL`` seconds. Reloading
+them all, rather than those with a higher id than last time, also finds
+rows whose transaction committed after a later one's. Revocations made by
+the current process apply right away, those of other workers within the
+interval. An entry stops counting at its token's
+exp and is dropped at the next poll, so the sets only hold what can still be
+presented and grow with the access token lifetime, not with time.
+"""
+import threading
+import time
+import uuid
+from typing import Any
+
+from django.conf import settings
+
+from sso2.core.models.revoked_token_model import RevokedToken
+from sso2.core.timeutils import now_timestamp
+
+
+class RevokedTokens:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # tenant id: jti: expires_at
+        self._expires_at: dict[uuid.UUID, dict[str, int]] = {}
+        self._next_poll = 0.0
+
+    def is_revoked(self, tenant_id: uuid.UUID, jti: str) -> bool:
+        self.refresh()
+        tenant_revoked = self._expires_at.get(tenant_id)
+        if not tenant_revoked:
+            return False
+        expires_at = tenant_revoked.get(jti)
+        return expires_at is not None and expires_at >= now_timestamp()
+
+    def add(self, tenant_id: uuid.UUID, jti: str, expires_at: int) -> None:
+        with self._lock:
+            self._expires_at.setdefault(tenant_id, {})[jti] = expires_at
+
+    def __len__(self) -> int:
+        return sum(len(tenant_revoked) for tenant_revoked in self._expires_at.values())
+
+    def refresh(self, *, force: bool = False) -> None:
+        if not force and time.monotonic() < self._next_poll:
+            return
+        with self._lock:
+            now = now_timestamp()
+            # Entries added by this process are kept, their rows may not
+            # be committed yet
+            expires_at_by_tenant: dict[uuid.UUID, dict[str, int]] = {}
+            for tenant_id, tenant_revoked in self._expires_at.items():
+                unexpired = {
+                    jti: expires_at
+                    for jti, expires_at in tenant_revoked.items()
+                    if expires_at >= now
+                }
+                if unexpired:
+                    expires_at_by_tenant[tenant_id] = unexpired
+            rows = RevokedToken.objects.filter(expires_at__gte=now).values_list(
+                "tenant_id",
+                "jti",
+                "expires_at",
+            )
+            for tenant_id, jti, expires_at in rows:
+                expires_at_by_tenant.setdefault(tenant_id, {})[jti] = expires_at
+            self._expires_at = expires_at_by_tenant
+            self._next_poll = time.monotonic() + settings.REVOKED_TOKEN_POLL_INTERVAL
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expires_at = {}
+            self._next_poll = 0.0
+
+
+revoked_tokens = RevokedTokens()
+
+
+def warm_revoked_tokens() -> int:
+    revoked_tokens.refresh(force=True)
+    return len(revoked_tokens)
+
+
+def token_revoked(sender: type, instance: RevokedToken, **kwargs: Any) -> None:
+    revoked_tokens.add(instance.tenant_id, instance.jti, instance.expires_at)
@@ -0,0 +1,16 @@
+import dataclasses
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from sso2.core.lru import get_cache_stats
+
+
+@require_http_methods(["GET"])
+@staff_member_required
+def cache_metrics(request: HttpRequest) -> HttpResponse:
+    """Counters of this worker's in-memory caches."""
+    return JsonResponse(
+        {name: dataclasses.asdict(stats) for name, stats in get_cache_stats().items()},
+    )
@@ -0,0 +1,93 @@
+"""In-process cache of Tenant rows, indexed by id and name."""
+import uuid
+from typing import Any
+
+from sso2.core.lru import LRUCache
+from sso2.core.models.tenant_model import Tenant, parse_tenant_id
+
+CacheKey = tuple[str, str]
+
+
+class TenantCache:
+    """Tenants are read on every request but almost never change.
+
+    Tenants are kept in an LRU cache of ``settings.TENANT_CACHE_SIZE``
+    entries for ``settings.TENANT_CACHE_TTL`` seconds. Saving or deleting a
+    tenant empties the cache right away in the current process, other worker
+    processes pick up the change when their entry expires.
+
+    Unknown names are remembered too, so requests for missing tenants do not
+    hit the database either. The names come from the Host and X-Tenant
+    headers, so they are kept in a separate cache of
+    ``settings.TENANT_CACHE_MISS_SIZE`` entries, where junk values can only
+    push out other junk.
+    """
+
+    def __init__(self) -> None:
+        self._tenants: LRUCache[CacheKey, Tenant] = LRUCache(
+            "tenants",
+            size_setting="TENANT_CACHE_SIZE",
+            ttl_setting="TENANT_CACHE_TTL",
+        )
+        self._misses: LRUCache[CacheKey, bool] = LRUCache(
+            "tenant_misses",
+            size_setting="TENANT_CACHE_MISS_SIZE",
+            ttl_setting="TENANT_CACHE_TTL",
+        )
+
+    def get(self, identifier: str | uuid.UUID) -> Tenant | None:
+        """Look up a tenant by id if identifier is a UUID, otherwise by name.
+
+        Names may look like UUIDs too, so strings which find no tenant by id
+        are also tried as a name.
+        """
+        tenant_id = parse_tenant_id(identifier)
+        if tenant_id is None:
+            return self.get_by_name(str(identifier))
+        tenant = self.get_by_id(tenant_id)
+        if tenant is None and isinstance(identifier, str):
+            tenant = self.get_by_name(identifier)
+        return tenant
+
+    def get_by_id(self, tenant_id: uuid.UUID | str) -> Tenant | None:
+        return self._get(("id", str(tenant_id)), pk=tenant_id)
+
+    def get_by_name(self, name: str) -> Tenant | None:
+        return self._get(("name", name), name=name)
+
+    def get_by_host(self, host: str) -> Tenant | None:
+        # Cached by the name the host maps to, not by the raw header value
+        return self.get_by_name(host.rsplit(".", 2)[0])
+
+    def _get(self, key: CacheKey, **lookup: Any) -> Tenant | None:
+        tenant = self._tenants.get(key)
+        if tenant is not None or self._misses.get(key):
+            return tenant
+        try:
+            tenant = Tenant.objects.get(**lookup)
+        except Tenant.DoesNotExist:
+            self._misses.put(key, True)  # noqa: FBT003
+            return None
+        self.add(tenant)
+        return tenant
+
+    def add(self, tenant: Tenant) -> None:
+        self._tenants.put(("id", str(tenant.id)), tenant)
+        self._tenants.put(("name", tenant.name), tenant)
+
+    def invalidate(self, tenant: Tenant) -> None:
+        # A renamed tenant is cached under its old name, and a new one may
+        # match a remembered miss. Tenants change rarely enough to simply
+        # start over.
+        self.clear()
+
+    def clear(self) -> None:
+        self._tenants.clear()
+        self._misses.clear()
+
+
+tenant_cache = TenantCache()
+
+
+def invalidate_cached_tenant(sender: type, instance: Tenant, **kwargs: Any) -> None:
+    tenant_cache.invalidate(instance)
@@ -6,8 +6,10 @@ import pytest
 from django.test import Client
 from rest_framework.exceptions import AuthenticationFailed
 
-from sso2.core.drfauth import parse_authorization_header
-from sso2.core.models import Tenant, User
+from sso2.core.drfauth import parse_authorization_header, verified_tokens
+from sso2.core.models import RevokedToken, Tenant, User
+from sso2.core.revoked_tokens import revoked_tokens
+from sso2.core.types import AssertNumQueries
 from sso2.oauth.grants.authorization_server import access_token_generator
 from sso2.oauth.models import OAuth2Client
 
@@ -99,3 +101,41 @@ def test_parse_authorization_header(
         assert parse_result.claims["iss"] == tenant.get_issuer()
         assert parse_result.claims["sub"] == user.pk
         assert isinstance(parse_result.claims["jti"], str)
+
+
+@pytest.mark.django_db
+def test_parse_authorization_header_cached(
+    tenant: Tenant,
+    user: User,
+    django_assert_num_queries: AssertNumQueries,
+) -> None:
+    verified_tokens.clear()
+    revoked_tokens.refresh(force=True)
+    oauth2_client = OAuth2Client.create_example(tenant=tenant)
+    oauth2_client.client_id = "DRFAUTHCLIENT"
+    oauth2_client.save()
+    authorization_header = AuthHeaderData().get_token(oauth2_client, user)
+    first = parse_authorization_header(
+        authorization_header=authorization_header,
+        tenant=tenant,
+    )
+    with django_assert_num_queries(0):
+        second = parse_authorization_header(
+            authorization_header=authorization_header,
+            tenant=tenant,
+        )
+        assert second.user == first.user
+        assert second.user is not first.user
+        assert second.user.username == user.username
+        assert second.claims is first.claims
+
+    RevokedToken.revoke(
+        tenant=tenant,
+        jti=first.claims["jti"],
+        expires_at=first.claims["exp"],
+    )
+    with pytest.raises(AuthenticationFailed, match="Token revoked"):
+        parse_authorization_header(
+            authorization_header=authorization_header,
+            tenant=tenant,
+        )
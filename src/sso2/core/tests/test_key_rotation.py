@@ -0,0 +1,47 @@
+import datetime
+
+import pytest
+from authlib.jose import jwt
+from django.conf import settings
+from django.utils import timezone
+
+from sso2.core.key_rotation import rotate_signing_keys
+from sso2.core.keyring import keyring
+from sso2.core.keyutils import JwsAlgorithm
+from sso2.core.models import Tenant
+from sso2.core.models.tenant_signing_key_model import SigningKeyState
+
+
+@pytest.mark.django_db
+def test_rotate_signing_keys() -> None:
+    tenant = Tenant.create_example(name="rotation", algorithm=JwsAlgorithm.EdDSA)
+    tenant.save()
+    now = timezone.now()
+    second = datetime.timedelta(seconds=1)
+
+    keys = rotate_signing_keys(tenant, now=now)
+    assert sorted(key.state for key in keys) == ["active", "next"]
+    signing_key = keyring.get(tenant)
+    assert signing_key.kid == tenant.get_private_key().thumbprint()
+    assert {key.kid for key in signing_key.key_set.keys} == {key.kid for key in keys}
+    old_token = signing_key.sign({"iss": tenant.get_issuer()})
+
+    # Nothing is due yet
+    assert rotate_signing_keys(tenant, now=now + second) == keys
+
+    now += settings.SIGNING_KEY_ROTATION_INTERVAL + second
+    keys = rotate_signing_keys(tenant, now=now)
+    states = {key.kid: key.state for key in keys}
+    assert sorted(states.values()) == ["active", "next", "retiring"]
+    assert states[signing_key.kid] == SigningKeyState.RETIRING
+    rotated_key = keyring.get(tenant)
+    assert states[rotated_key.kid] == SigningKeyState.ACTIVE
+    assert {key.kid for key in rotated_key.key_set.keys} == set(states)
+    assert jwt.decode(old_token, rotated_key.key_set)["iss"] == tenant.get_issuer()
+
+    now += settings.SIGNING_KEY_OVERLAP
+    keys = rotate_signing_keys(tenant, now=now)
+    assert sorted(key.state for key in keys) == ["active", "next"]
+    assert signing_key.kid not in {key.kid for key in keys}
+    with pytest.raises(ValueError, match="Invalid JSON Web Key Set"):
+        jwt.decode(old_token, keyring.get(tenant).key_set)
@@ -0,0 +1,53 @@
+import pytest
+from cryptography.fernet import Fernet
+from django.core.exceptions import ImproperlyConfigured
+from pytest_django.fixtures import SettingsWrapper
+
+from sso2.core.key_store import decrypt_private_key, get_fernet, key_store
+from sso2.core.keyutils import JwsAlgorithm
+from sso2.core.models import CacheGeneration, EncryptedKey, Tenant
+from sso2.core.types import AssertNumQueries
+
+
+@pytest.mark.django_db
+def test_tenant_key_stored_encrypted(
+    settings: SettingsWrapper,
+    django_assert_num_queries: AssertNumQueries,
+) -> None:
+    settings.TENANT_KEY_STORAGE = "database"
+    settings.KEY_STORE_POLL_INTERVAL = 0
+    tenant = Tenant.create_example(name="stored", algorithm=JwsAlgorithm.EdDSA)
+    tenant.save()
+    assert tenant.key is not None
+    assert not tenant.private_key_path
+    assert b"PRIVATE KEY" not in bytes(tenant.key.encrypted_private_key)
+
+    key_store.clear()
+    private_key = tenant.get_private_key()
+    assert private_key.thumbprint() == tenant.key.kid
+    assert tenant.get_public_key().thumbprint() == tenant.key.kid
+    # Only the generation is polled
+    with django_assert_num_queries(1):
+        assert tenant.get_private_key() is private_key
+
+    # Another worker changed a key
+    CacheGeneration.bump("keys")
+    with django_assert_num_queries(2):
+        assert tenant.get_private_key() is not private_key
+
+
+@pytest.mark.django_db
+def test_key_encryption_key_rotation(settings: SettingsWrapper, tenant: Tenant) -> None:
+    stored = EncryptedKey.store(tenant.get_private_key(), tenant.algorithm)
+    settings.KEY_ENCRYPTION_KEYS = [
+        Fernet.generate_key().decode(),
+        *settings.KEY_ENCRYPTION_KEYS,
+    ]
+    private_key = decrypt_private_key(stored.encrypted_private_key)
+    assert private_key.thumbprint() == tenant.get_private_key().thumbprint()
+
+
+def test_get_fernet_requires_keys(settings: SettingsWrapper) -> None:
+    settings.KEY_ENCRYPTION_KEYS = []
+    with pytest.raises(ImproperlyConfigured):
+        get_fernet()
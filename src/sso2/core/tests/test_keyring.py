@@ -0,0 +1,75 @@
+import pytest
+from authlib.jose import jwt
+from authlib.oidc.core import UserInfo
+from authlib.oidc.core.grants.util import generate_id_token
+
+from sso2.core.keyring import SigningKey, keyring
+from sso2.core.keyutils import JwsAlgorithm, generate_private_key
+from sso2.core.models import Tenant
+
+
+def test_signing_key(tenant: Tenant) -> None:
+    signing_key = keyring.get(tenant)
+    assert keyring.get(tenant) is signing_key
+    assert signing_key.kid == tenant.get_private_key().thumbprint()
+    assert signing_key.issuer == tenant.get_issuer()
+
+    payload = {"iss": tenant.get_issuer(), "sub": "subject"}
+    header = {"typ": "JWT", "alg": tenant.algorithm, "kid": signing_key.kid}
+    token = signing_key.sign(payload)
+    assert token == jwt.encode(header, payload, tenant.get_private_key()).decode()
+
+    claims = jwt.decode(token, tenant.get_public_key())
+    assert claims == payload
+    assert claims.header == {
+        "typ": "JWT",
+        "alg": tenant.algorithm,
+        "kid": signing_key.kid,
+    }
+
+
+@pytest.mark.django_db
+def test_signing_key_invalidated_on_save(tenant: Tenant) -> None:
+    signing_key = keyring.get(tenant)
+    tenant.save()
+    assert keyring.get(tenant) is not signing_key
+
+
+@pytest.mark.parametrize(
+    "algorithm",
+    [JwsAlgorithm.RS256, JwsAlgorithm.ES256, JwsAlgorithm.EdDSA],
+)
+def test_signing_key_algorithms(algorithm: JwsAlgorithm) -> None:
+    tenant = Tenant.create_example(
+        name=f"test-{algorithm.lower()}",
+        algorithm=algorithm,
+    )
+    signing_key = SigningKey.from_tenant(tenant)
+    token = signing_key.sign({"iss": tenant.get_issuer()})
+
+    claims = jwt.decode(token, tenant.get_public_key())
+    assert claims.header["alg"] == algorithm
+    assert claims["iss"] == tenant.get_issuer()
+    assert tenant.get_certificate().public_key() == tenant.get_public_key().public_key
+
+
+def test_generate_private_key_unsupported_algorithm() -> None:
+    with pytest.raises(ValueError, match="Unsupported signing algorithm: HS256"):
+        generate_private_key(JwsAlgorithm.HS256)
+
+
+def test_signing_key_jwt_config(tenant: Tenant) -> None:
+    signing_key = keyring.get(tenant)
+    config = signing_key.get_jwt_config()
+    assert config is not signing_key.get_jwt_config()
+    assert config == {
+        "key": signing_key.key,
+        "alg": tenant.algorithm,
+        "iss": tenant.get_issuer(),
+        "exp": 3600,
+    }
+
+    id_token = generate_id_token({}, UserInfo(sub="subject"), aud=["aud"], **config)
+    claims = jwt.decode(id_token, tenant.get_public_key())
+    assert claims["iss"] == tenant.get_issuer()
+    assert claims["sub"] == "subject"
@@ -1,7 +1,18 @@
+from pathlib import Path
+
 import pytest
 from cryptography.hazmat.primitives.serialization import Encoding
 
-from sso2.core.keyutils import create_client_certificate, parse_client_certificate
+from sso2.core import keyutils
+from sso2.core.keyutils import (
+    JwsAlgorithm,
+    count_pooled_keys,
+    create_client_certificate,
+    create_key_pair,
+    fill_key_pool,
+    parse_client_certificate,
+    take_pooled_key,
+)
 from sso2.core.models import Tenant
 
 
@@ -58,3 +69,24 @@ def test_create_client_certificate(
     assert client_certificate.tls_client_auth_san_ip == tls_client_auth_san_ip
     assert client_certificate.tls_client_auth_san_uri == tls_client_auth_san_uri
     assert client_certificate.tls_client_auth_san_email == tls_client_auth_san_email
+
+
+def test_key_pool(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(keyutils, "key_dir", tmp_path)
+    assert take_pooled_key(JwsAlgorithm.EdDSA) is None
+
+    pool_size = 2
+    assert fill_key_pool(JwsAlgorithm.EdDSA, pool_size) == pool_size
+    assert fill_key_pool(JwsAlgorithm.EdDSA, pool_size) == 0
+    first = take_pooled_key(JwsAlgorithm.EdDSA)
+    second = take_pooled_key(JwsAlgorithm.EdDSA)
+    assert first is not None
+    assert second is not None
+    assert first.thumbprint() != second.thumbprint()
+    assert take_pooled_key(JwsAlgorithm.EdDSA) is None
+
+    fill_key_pool(JwsAlgorithm.EdDSA, 1)
+    public_key, private_key = create_key_pair("pooled", JwsAlgorithm.EdDSA)
+    assert count_pooled_keys(JwsAlgorithm.EdDSA) == 0
+    assert private_key.path == tmp_path / "pooled-private_key.pem"
+    assert public_key.key.thumbprint() == private_key.key.thumbprint()
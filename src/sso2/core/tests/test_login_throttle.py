@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+from django.test import RequestFactory
+from pytest_django.fixtures import SettingsWrapper
+
+from sso2.core import auth_backend
+from sso2.core.auth_backend import DjangoAuthBackend
+from sso2.core.login_throttle import LoginThrottledError, TokenBucketStore
+from sso2.core.models import User
+
+
+def test_token_bucket_store(tmp_path: Path) -> None:
+    path = tmp_path / "buckets.sqlite3"
+    # Two stores on one file behave like two worker processes
+    store, other_store = TokenBucketStore(path), TokenBucketStore(path)
+    assert store.take({"a": (2, 10)}) == 0
+    assert other_store.take({"a": (2, 10)}) == 0
+    assert 0 < store.take({"a": (2, 10)}) <= 5  # noqa: PLR2004
+
+    # Nothing is taken from "b" when "a" is empty
+    assert store.take({"a": (2, 10), "b": (1, 10)}) > 0
+    assert store.take({"b": (1, 10)}) == 0
+
+
+@pytest.mark.django_db
+def test_authenticate_throttled_before_hashing(
+    settings: SettingsWrapper,
+    tmp_path: Path,
+    rf: RequestFactory,
+    monkeypatch: pytest.MonkeyPatch,
+    user: User,
+) -> None:
+    settings.LOGIN_THROTTLE_PATH = tmp_path / "buckets.sqlite3"
+    settings.LOGIN_THROTTLE_RATES = {**settings.LOGIN_THROTTLE_RATES, "user": (1, 600)}
+    backend = DjangoAuthBackend()
+    credentials = {"username": user.username, "password": "wrong"}
+    request = rf.post("/login")
+    assert backend.authenticate(request, tenant=user.tenant, **credentials) is None
+
+    def check_password(user: User, password: str) -> bool:
+        raise AssertionError("throttled logins must not hash")
+
+    def check_dummy_password(tenant_id: object, password: str) -> None:
+        raise AssertionError("throttled logins must not hash")
+
+    monkeypatch.setattr(auth_backend, "check_password", check_password)
+    monkeypatch.setattr(auth_backend, "check_dummy_password", check_dummy_password)
+    with pytest.raises(LoginThrottledError) as excinfo:
+        backend.authenticate(request, tenant=user.tenant, **credentials)
+    assert excinfo.value.retry_after > 0
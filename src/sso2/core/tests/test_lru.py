@@ -0,0 +1,66 @@
+import http
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from pytest_django.fixtures import SettingsWrapper
+
+from sso2.core.lru import CacheStats, LRUCache, get_cache_stats
+from sso2.core.models import Tenant, User
+
+
+def test_lru_cache(settings: SettingsWrapper) -> None:
+    settings.TEST_CACHE_SIZE = 2
+    cache: LRUCache[str, int] = LRUCache("test", size_setting="TEST_CACHE_SIZE")
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get_or_set("c", lambda: 4) == 3  # noqa: PLR2004
+    assert cache.stats() == CacheStats(
+        size=2,
+        maxsize=2,
+        hits=2,
+        misses=1,
+        evictions=1,
+        hit_ratio=2 / 3,
+    )
+    assert get_cache_stats()["test"] == cache.stats()
+
+
+def test_lru_cache_ttl(settings: SettingsWrapper) -> None:
+    settings.TEST_CACHE_SIZE = 2
+    settings.TEST_CACHE_TTL = 0
+    cache: LRUCache[str, int] = LRUCache(
+        "test-ttl",
+        size_setting="TEST_CACHE_SIZE",
+        ttl_setting="TEST_CACHE_TTL",
+    )
+    cache.put("a", 1)
+    assert cache.get("a") is None
+
+
+@pytest.mark.django_db
+def test_cache_metrics(test_client: Client, tenant: Tenant) -> None:
+    url = reverse("cache_metrics")
+    response = test_client.get(url)
+    assert response.status_code == http.HTTPStatus.FOUND
+
+    staff = User.objects.create_user(
+        username="staff",
+        email="staff@example.com",
+        tenant=tenant,
+        is_staff=True,
+    )
+    test_client.force_login(staff)
+    response = test_client.get(url)
+    assert response.status_code == http.HTTPStatus.OK
+    assert set(response.json()["keyring"]) == {
+        "size",
+        "maxsize",
+        "hits",
+        "misses",
+        "evictions",
+        "hit_ratio",
+    }
@@ -0,0 +1,43 @@
+from sso2.core.password_calibration import (
+    Argon2Parameters,
+    calibrate,
+    measure,
+    simulate_logins,
+)
+
+CHEAP = Argon2Parameters(time_cost=1, memory_cost=8, parallelism=1)
+DEARER = Argon2Parameters(time_cost=2, memory_cost=64, parallelism=1)
+
+
+def test_measure() -> None:
+    measurement = measure(CHEAP, samples=3)
+    assert 0 < measurement.mean <= measurement.p99
+    assert measurement.per_core_throughput > 0
+
+
+def test_calibrate_picks_most_expensive_within_target() -> None:
+    best, measurements = calibrate(
+        [CHEAP, DEARER],
+        target_latency=1,
+        logins_per_second=1,
+        samples=3,
+        cores=1,
+    )
+    assert best == DEARER
+    assert [measurement.parameters for measurement in measurements] == [
+        CHEAP,
+        DEARER,
+    ]
+
+    best, _ = calibrate(
+        [CHEAP],
+        target_latency=0,
+        logins_per_second=1,
+        samples=1,
+    )
+    assert best is None
+
+
+def test_simulate_logins() -> None:
+    p99 = simulate_logins(CHEAP, logins_per_second=100, duration=0.05, workers=1)
+    assert p99 > 0
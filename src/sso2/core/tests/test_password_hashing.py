@@ -0,0 +1,139 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth import hashers
+from django.http import HttpResponse
+from django.test import RequestFactory
+from pytest_django.fixtures import SettingsWrapper
+
+from sso2.core.auth_backend import DjangoAuthBackend
+from sso2.core.middleware.password_hashing_middleware import (
+    PasswordHashingMiddleware,
+)
+from sso2.core.models import Tenant, User
+from sso2.core.password_hashing import (
+    PasswordHashingBusyError,
+    PasswordHashingPool,
+    TenantPasswordHashingLimitError,
+    check_password,
+    get_dummy_hash,
+)
+
+
+def test_password_hashing_pool_admission(settings: SettingsWrapper) -> None:
+    settings.PASSWORD_HASH_WORKERS = 2
+    settings.PASSWORD_HASH_QUEUE_SIZE = 0
+    settings.PASSWORD_HASH_TENANT_LIMIT = 1
+    tenant_a, tenant_b, tenant_c = (Tenant(name=name) for name in "abc")
+    pool = PasswordHashingPool()
+    release = threading.Event()
+    results: list[str] = []
+
+    def block(started: threading.Event) -> str:
+        started.set()
+        release.wait()
+        return "done"
+
+    def run_blocking(tenant: Tenant) -> threading.Thread:
+        started = threading.Event()
+        thread = threading.Thread(
+            target=lambda: results.append(pool.run(tenant.id, block, started)),
+        )
+        thread.start()
+        assert started.wait(timeout=5)
+        return thread
+
+    threads = [run_blocking(tenant_a)]
+    with pytest.raises(TenantPasswordHashingLimitError):
+        pool.run(tenant_a.id, str)
+    threads.append(run_blocking(tenant_b))
+    with pytest.raises(PasswordHashingBusyError):
+        pool.run(tenant_c.id, str)
+
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert results == ["done", "done"]
+    assert pool.run(tenant_c.id, str, 1) == "1"
+    pool.shutdown()
+
+
+@pytest.mark.django_db
+def test_check_password(user: User) -> None:
+    user.set_password("s3cret")
+    user.save(update_fields=["password"])
+    assert check_password(user, "s3cret")
+    assert not check_password(user, "wrong")
+
+
+@pytest.mark.django_db
+def test_authenticate_refused_when_pool_is_full(
+    settings: SettingsWrapper,
+    rf: RequestFactory,
+    user: User,
+) -> None:
+    settings.PASSWORD_HASH_TENANT_LIMIT = 0
+    request = rf.post("/login")
+    with pytest.raises(TenantPasswordHashingLimitError) as excinfo:
+        DjangoAuthBackend().authenticate(
+            request,
+            username=user.username,
+            password="password",
+            tenant=user.tenant,
+        )
+
+    middleware = PasswordHashingMiddleware(lambda request: HttpResponse())
+    response = middleware.process_exception(request, excinfo.value)
+    assert response is not None
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response["Retry-After"] == str(settings.PASSWORD_HASH_RETRY_AFTER)
+    assert middleware.process_exception(request, ValueError()) is None
+
+
+def test_dummy_hash(settings: SettingsWrapper) -> None:
+    dummy_hash = get_dummy_hash()
+    assert dummy_hash.startswith("argon2$")
+    assert get_dummy_hash() is dummy_hash
+
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    assert get_dummy_hash().startswith("md5$")
+
+
+@pytest.mark.django_db
+def test_authenticate_unknown_user_uses_dummy_hash(
+    monkeypatch: pytest.MonkeyPatch,
+    rf: RequestFactory,
+    tenant: Tenant,
+) -> None:
+    get_dummy_hash()
+
+    def make_password(password: str) -> str:
+        raise AssertionError("no new hash should be made")
+
+    monkeypatch.setattr(hashers, "make_password", make_password)
+    assert (
+        DjangoAuthBackend().authenticate(
+            rf.post("/login"),
+            username="missing",
+            password="password",
+            tenant=tenant,
+        )
+        is None
+    )
+
+
+@pytest.mark.django_db
+def test_check_password_rehashes_changed_parameters(
+    settings: SettingsWrapper,
+    user: User,
+) -> None:
+    user.set_password("s3cret")
+    user.save(update_fields=["password"])
+    assert "t=2" in user.password
+
+    settings.ARGON2_TIME_COST = 3
+    assert check_password(user, "s3cret")
+    user.refresh_from_db()
+    assert "t=3" in user.password
+    assert check_password(user, "s3cret")
@@ -0,0 +1,94 @@
+import uuid
+
+import pytest
+from pytest_django.fixtures import SettingsWrapper
+
+from sso2.core.models import RevokedToken, Tenant
+from sso2.core.revoked_tokens import revoked_tokens, warm_revoked_tokens
+from sso2.core.timeutils import now_timestamp
+from sso2.core.types import AssertNumQueries
+
+
+@pytest.mark.django_db
+def test_revoked_tokens(
+    settings: SettingsWrapper,
+    tenant: Tenant,
+    django_assert_num_queries: AssertNumQueries,
+) -> None:
+    settings.REVOKED_TOKEN_POLL_INTERVAL = 60
+    revoked_tokens.clear()
+    assert not revoked_tokens.is_revoked(tenant.id, "local")
+
+    RevokedToken.revoke(tenant=tenant, jti="local", expires_at=now_timestamp() + 60)
+    # Rows written by another process do not send signals here
+    RevokedToken.objects.bulk_create(
+        [RevokedToken(tenant=tenant, jti="remote", expires_at=now_timestamp() + 60)],
+    )
+    with django_assert_num_queries(0):
+        assert revoked_tokens.is_revoked(tenant.id, "local")
+        assert not revoked_tokens.is_revoked(tenant.id, "remote")
+
+    revoked_tokens.refresh(force=True)
+    assert revoked_tokens.is_revoked(tenant.id, "remote")
+    assert not revoked_tokens.is_revoked(uuid.uuid4(), "remote")
+
+
+@pytest.mark.django_db
+def test_revoked_tokens_committed_late(tenant: Tenant) -> None:
+    revoked_tokens.clear()
+    expires_at = now_timestamp() + 60
+    first, _ = RevokedToken.objects.bulk_create(
+        [
+            RevokedToken(tenant=tenant, jti="first", expires_at=expires_at),
+            RevokedToken(tenant=tenant, jti="second", expires_at=expires_at),
+        ],
+    )
+    first_id = first.id
+    first.delete()
+    revoked_tokens.refresh(force=True)
+    assert revoked_tokens.is_revoked(tenant.id, "second")
+
+    # A row with a lower id, committed after the poll that saw "second"
+    RevokedToken.objects.bulk_create(
+        [RevokedToken(id=first_id, tenant=tenant, jti="late", expires_at=expires_at)],
+    )
+    revoked_tokens.refresh(force=True)
+    assert revoked_tokens.is_revoked(tenant.id, "late")
+
+
+@pytest.mark.django_db
+def test_revoked_tokens_expire(
+    settings: SettingsWrapper,
+    monkeypatch: pytest.MonkeyPatch,
+    tenant: Tenant,
+    django_assert_num_queries: AssertNumQueries,
+) -> None:
+    settings.REVOKED_TOKEN_POLL_INTERVAL = 60
+    revoked_tokens.clear()
+    now = now_timestamp()
+    RevokedToken.objects.bulk_create(
+        [
+            RevokedToken(tenant=tenant, jti="valid", expires_at=now + 60),
+            RevokedToken(tenant=tenant, jti="expiring", expires_at=now),
+        ],
+    )
+    # Loaded when a worker starts
+    assert warm_revoked_tokens() == 2  # noqa: PLR2004
+
+    monkeypatch.setattr("sso2.core.revoked_tokens.now_timestamp", lambda: now + 1)
+    with django_assert_num_queries(0):
+        assert revoked_tokens.is_revoked(tenant.id, "valid")
+        assert not revoked_tokens.is_revoked(tenant.id, "expiring")
+    revoked_tokens.refresh(force=True)
+    assert len(revoked_tokens) == 1
+
+
+@pytest.mark.django_db
+def test_revoke_prunes_expired(tenant: Tenant) -> None:
+    RevokedToken.objects.create(
+        tenant=tenant,
+        jti="expired",
+        expires_at=now_timestamp() - 1,
+    )
+    RevokedToken.revoke(tenant=tenant, jti="new", expires_at=now_timestamp() + 60)
+    assert list(RevokedToken.objects.values_list("jti", flat=True)) == ["new"]
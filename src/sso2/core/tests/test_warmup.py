@@ -0,0 +1,29 @@
+import pytest
+from django.utils import timezone
+from pytest_django.fixtures import SettingsWrapper
+
+from sso2.core.keyring import keyring
+from sso2.core.models import Tenant, User
+from sso2.core.tenant_cache import tenant_cache
+from sso2.core.types import AssertNumQueries
+from sso2.core.warmup import run_warmups
+
+
+@pytest.mark.django_db
+def test_run_warmups(
+    settings: SettingsWrapper,
+    tenant: Tenant,
+    user: User,
+    django_assert_num_queries: AssertNumQueries,
+) -> None:
+    settings.CACHE_WARMUP_TENANTS = 10
+    user.last_login = timezone.now()
+    user.save(update_fields=["last_login"])
+    tenant_cache.clear()
+    keyring.clear()
+
+    results = run_warmups()
+    assert results["tenants"][0] == 1
+    with django_assert_num_queries(0):
+        assert tenant_cache.get_by_name(tenant.name) == tenant
+        assert keyring.get(tenant).kid == tenant.get_private_key().thumbprint()
@@ -1,7 +1,10 @@
+from collections.abc import Callable
+from contextlib import AbstractContextManager
 from typing import Any, TypedDict
 
 from django.http import HttpRequest
 
+from sso2.core.keyutils import TenantKey
 from sso2.core.models.tenant_model import Tenant
 from sso2.core.models.user_model import User
 
@@ -12,7 +15,11 @@ class HttpRequestWithUser(HttpRequest):
 
 
 class JwtConfig(TypedDict):
-    key: dict[str, Any]
+    key: TenantKey
     alg: str
     iss: str
     exp: int
+
+
+# Type of pytest-django's django_assert_num_queries fixture
+AssertNumQueries = Callable[[int], AbstractContextManager[Any]]
@@ -4,6 +4,7 @@ from django.urls import path
 from sso2.core.api.application import ApplicationViewSet
 from sso2.core.api.tenant import TenantViewSet
 from sso2.core.pathrouter import PathRouter
+from sso2.core.routes.cache_metrics import cache_metrics
 from sso2.core.routes.login_form import NewLoginView
 from sso2.core.routes.register import register
 from sso2.core.routes.reset_password import reset_password
@@ -39,4 +40,5 @@ urlpatterns += [
         subdomain,
         name="subdomain",
     ),
+    path("metrics/caches", cache_metrics, name="cache_metrics"),
 ]
@@ -0,0 +1,69 @@
+"""Fill the in-memory caches before a worker serves its first request.
+
+Apps register warm-up functions in their ``AppConfig.ready()``. The WSGI and
+ASGI entry points run them once the application is loaded. Running
+``ssotool cache warm`` shows what a worker loads and how long it takes.
+"""
+import datetime
+import logging
+import time
+from collections.abc import Callable
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from sso2.core.keyring import keyring
+from sso2.core.models import Tenant
+from sso2.core.tenant_cache import tenant_cache
+
+log = logging.getLogger(__name__)
+
+# Returns the number of entries it loaded
+Warmup = Callable[[], int]
+warmups: dict[str, Warmup] = {}
+
+
+def register_warmup(name: str, warmup: Warmup) -> None:
+    warmups[name] = warmup
+
+
+def run_warmups() -> dict[str, tuple[int, float]]:
+    """Run all warm-ups, returns what each loaded and the seconds it took.
+
+    A failing warm-up is logged and skipped, the caches then fill on
+    demand as they would without it.
+    """
+    results = {}
+    for name, warmup in warmups.items():
+        start = time.perf_counter()
+        try:
+            loaded = warmup()
+        except Exception:
+            log.exception("Cache warm-up %r failed", name)
+            continue
+        results[name] = (loaded, time.perf_counter() - start)
+    return results
+
+
+def get_hottest_tenants(count: int) -> list[Tenant]:
+    """Return the count tenants with the most users who logged in during the
+    last week. Only each user's last login is stored, so that is what
+    is counted, not every login."""
+    if count <= 0:
+        return []
+    since = timezone.now() - datetime.timedelta(days=7)
+    return list(
+        Tenant.objects.filter(user__last_login__gte=since)
+        .annotate(active_users=Count("user"))
+        .order_by("-active_users")[:count],
+    )
+
+
+def warm_tenants() -> int:
+    """Load the hottest tenants together with their keys and JWKS."""
+    tenants = get_hottest_tenants(settings.CACHE_WARMUP_TENANTS)
+    for tenant in tenants:
+        tenant_cache.add(tenant)
+        keyring.get(tenant)
+    return len(tenants)
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_project.settings")
 
 application = get_asgi_application()
+
+# Fill the caches before the first request, see sso2.core.warmup
+from sso2.core.warmup import run_warmups  # noqa: E402
+
+run_warmups()
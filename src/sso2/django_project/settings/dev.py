@@ -1,3 +1,9 @@
 from .settings import *
+from .settings import KEY_ENCRYPTION_KEYS
 
 DEBUG = True
+
+# SECURITY WARNING: only for development, production must set its own keys
+KEY_ENCRYPTION_KEYS = KEY_ENCRYPTION_KEYS or [
+    "ZGphbmdvLWluc2VjdXJlLWtleS1lbmNyeXB0aW9uLWs=",
+]
@@ -9,7 +9,9 @@ https://docs.djangoproject.com/en/4.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
+import datetime
 import os
+import tempfile
 import urllib.parse
 from pathlib import Path
 
@@ -55,6 +57,7 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "sso2.core.middleware.tenant_middleware.TenantMiddleware",
+    "sso2.core.middleware.password_hashing_middleware.PasswordHashingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -126,8 +129,13 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 PASSWORD_HASHERS = [
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "sso2.core.hashers.TunedArgon2PasswordHasher",
 ]
+# Argon2id cost, run "ssotool passwords calibrate" to size it for the
+# machine. Passwords hashed with other values are rehashed at login.
+ARGON2_TIME_COST = 2
+ARGON2_MEMORY_COST = 102400
+ARGON2_PARALLELISM = 8
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -162,6 +170,74 @@ AUTHENTICATION_BACKENDS = [
     "sso2.core.auth_backend.DjangoAuthBackend",
 ]
 TESTING = False
+# Tenants kept in each worker's TenantCache, unknown tenant names remembered
+# next to them, and for how many seconds
+TENANT_CACHE_SIZE = 4096
+TENANT_CACHE_MISS_SIZE = 1024
+TENANT_CACHE_TTL = 60
+# Tenants whose discovery document is kept serialized in each worker
+OPENID_CONFIGURATION_CACHE_SIZE = 1024
+# OAuth2 clients kept in each worker's ClientCache, and for how many seconds
+OAUTH2_CLIENT_CACHE_SIZE = 4096
+OAUTH2_CLIENT_CACHE_TTL = 60
+# Most tokens a single batch introspection request may hold
+INTROSPECTION_BATCH_SIZE = 100
+# Introspection responses kept in each worker, and for at most how many
+# seconds (never past the token's expiry)
+INTROSPECTION_CACHE_SIZE = 8192
+INTROSPECTION_CACHE_TTL = 30
+# Tenants whose signing keys are kept in each worker's Keyring, and for how
+# many seconds
+KEYRING_CACHE_SIZE = 1024
+KEYRING_CACHE_TTL = 300
+# Keys read from files kept per worker
+KEY_FILE_CACHE_SIZE = 2048
+# How many of the tenants with the most logins and the clients with the most
+# tokens are loaded into the caches at worker boot, 0 disables the warm-up
+CACHE_WARMUP_TENANTS = 0
+CACHE_WARMUP_CLIENTS = 0
+# How long a signing key is active, and how long a key is published before
+# it becomes active and after it has been replaced. The overlap must be
+# longer than the lifetime of tokens and of cached JWKS documents.
+SIGNING_KEY_ROTATION_INTERVAL = datetime.timedelta(days=90)
+SIGNING_KEY_OVERLAP = datetime.timedelta(days=1)
+# Where new tenant keys are kept, "files" or "database" (encrypted, needs
+# KEY_ENCRYPTION_KEYS). Existing keys keep working whichever is chosen.
+TENANT_KEY_STORAGE = os.environ.get("TENANT_KEY_STORAGE", "files")
+# Fernet keys for the stored private keys, the first one encrypts and all of
+# them decrypt, so a new key can be put first without re-encrypting. Set as a
+# comma separated list in KEY_ENCRYPTION_KEYS, there is no default outside of
+# the dev settings.
+KEY_ENCRYPTION_KEYS = [
+    key for key in os.environ.get("KEY_ENCRYPTION_KEYS", "").split(",") if key
+]
+# Decrypted keys kept per worker, for how many seconds, and how often workers
+# check whether another process has changed a key
+KEY_STORE_CACHE_SIZE = 1024
+KEY_STORE_CACHE_TTL = 300
+KEY_STORE_POLL_INTERVAL = 5
+# Password logins allowed per username, client IP and OAuth2 client, as
+# (burst, seconds to refill the burst). The buckets are shared by the workers
+# on a node through a SQLite file.
+LOGIN_THROTTLE_RATES = {
+    "user": (10, 600),
+    "ip": (100, 60),
+    "client": (1000, 60),
+}
+LOGIN_THROTTLE_PATH = Path(tempfile.gettempdir()) / "sso2-login-throttle.sqlite3"
+# Verified API bearer tokens kept per worker, and for at most how many
+# seconds (never past the token's exp)
+VERIFIED_TOKEN_CACHE_SIZE = 4096
+VERIFIED_TOKEN_CACHE_TTL = 60
+# How often each worker fetches tokens revoked by other processes
+REVOKED_TOKEN_POLL_INTERVAL = 5
+# Password hashing threads per worker process, how many hashes may wait for
+# one and how many a single tenant may have running or waiting. Requests
+# beyond that get a 503 (or 429 for the tenant limit) with this Retry-After.
+PASSWORD_HASH_WORKERS = os.cpu_count() or 1
+PASSWORD_HASH_QUEUE_SIZE = 32
+PASSWORD_HASH_TENANT_LIMIT = 16
+PASSWORD_HASH_RETRY_AFTER = 1
 
 # FIXME: Move out of settings
 app_host_url = urllib.parse.urlparse(APP_HOST)
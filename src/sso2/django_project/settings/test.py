@@ -1,8 +1,14 @@
 import os
+import tempfile
+from pathlib import Path
 
 from .dev import *
 from .dev import BASE_DIR, DATABASES
 
 DEBUG = True
 DATABASES["default"]["NAME"] = BASE_DIR / "db-test.sqlite3"
+TENANT_KEY_STORAGE = "files"
+# Tests log in far more often than people do
+LOGIN_THROTTLE_RATES = {"user": (10000, 1), "ip": (10000, 1), "client": (10000, 1)}
+LOGIN_THROTTLE_PATH = Path(tempfile.gettempdir()) / "sso2-login-throttle-test.sqlite3"
 os.environ["AUTHLIB_INSECURE_TRANSPORT"] = "true"
@@ -2,11 +2,13 @@ import secrets
 from uuid import uuid4
 
 from django.contrib import admin
+from django.db.models import QuerySet
 from django.http import HttpRequest
 from django.utils.safestring import SafeString, mark_safe
 
 from sso2.core.admin import FORM_FIELD_OVERRIDES
 from sso2.core.urlutils import build_change_url
+from sso2.oauth.client_cache import client_cache
 from sso2.oauth.models.authorization_code_model import AuthorizationCode
 from sso2.oauth.models.oauth2_client_model import OAuth2Client
 from sso2.oauth.models.oauth2_token_model import OAuth2Token
@@ -51,6 +53,7 @@ class OAuth2TokenAdmin(admin.ModelAdmin[OAuth2Token]):
         "expires_in",
         "revoked",
     ]
+    actions = ["revoke_tokens"]
 
     @admin.display()
     def token(self, token: OAuth2Token) -> SafeString:
@@ -64,6 +67,21 @@ class OAuth2TokenAdmin(admin.ModelAdmin[OAuth2Token]):
         client = OAuth2Client.objects.get(client_id=token.client_id)
         return build_change_url(client)
 
+    @admin.action(description="Revoke selected tokens")
+    def revoke_tokens(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet[OAuth2Token],
+    ) -> None:
+        revoked = 0
+        for token in queryset.filter(revoked=False):
+            client = client_cache.get(token.client_id)
+            # Tokens of deleted clients cannot be used anymore
+            if client is not None:
+                token.revoke(tenant=client.tenant)
+                revoked += 1
+        self.message_user(request, f"Revoked {revoked} tokens")
+
 
 admin.site.register(OAuth2Token, OAuth2TokenAdmin)
 
@@ -1,6 +1,27 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class OauthConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "sso2.oauth"
+
+    def ready(self) -> None:
+        from sso2.core.warmup import register_warmup
+        from sso2.oauth.client_cache import (
+            invalidate_cached_client,
+            invalidate_cached_tenant_clients,
+            warm_clients,
+        )
+        from sso2.oauth.introspection_cache import invalidate_introspected_token
+        from sso2.oauth.routes.openid_configuration import warm_configurations
+
+        post_save.connect(invalidate_cached_client, sender="oauth.OAuth2Client")
+        post_delete.connect(invalidate_cached_client, sender="oauth.OAuth2Client")
+        post_save.connect(invalidate_cached_tenant_clients, sender="core.Tenant")
+        post_delete.connect(invalidate_cached_tenant_clients, sender="core.Tenant")
+        post_save.connect(invalidate_introspected_token, sender="oauth.OAuth2Token")
+        post_delete.connect(invalidate_introspected_token, sender="oauth.OAuth2Token")
+
+        register_warmup("clients", warm_clients)
+        register_warmup("openid-configuration", warm_configurations)
@@ -0,0 +1,94 @@
+"""In-process cache of OAuth2 clients, keyed by client_id."""
+from typing import Any
+
+from django.conf import settings
+from django.db.models import Count
+
+from sso2.core.lru import LRUCache
+from sso2.core.models import Tenant
+from sso2.core.timeutils import now_timestamp
+from sso2.oauth.models.oauth2_client_model import OAuth2Client
+from sso2.oauth.models.oauth2_token_model import OAuth2Token
+
+
+class ClientCache:
+    """Every token, authorize, introspect and revoke call looks up its client.
+
+    Clients are loaded together with their tenant and kept in an LRU cache of
+    ``settings.OAUTH2_CLIENT_CACHE_SIZE`` entries for
+    ``settings.OAUTH2_CLIENT_CACHE_TTL`` seconds. Saving or deleting a client,
+    or a tenant, drops it right away in the current process, other worker
+    processes pick up the change when their entry expires. Unknown client ids
+    are not remembered. The cached instances are shared and must not be
+    modified.
+    """
+
+    def __init__(self) -> None:
+        self._clients: LRUCache[str, OAuth2Client] = LRUCache(
+            "oauth2_clients",
+            size_setting="OAUTH2_CLIENT_CACHE_SIZE",
+            ttl_setting="OAUTH2_CLIENT_CACHE_TTL",
+        )
+
+    def get(self, client_id: str) -> OAuth2Client | None:
+        client = self._clients.get(client_id)
+        if client is not None:
+            return client
+        try:
+            client = OAuth2Client.objects.select_related("tenant").get(
+                client_id=client_id,
+            )
+        except OAuth2Client.DoesNotExist:
+            return None
+        # Split the client's space separated fields before it is shared
+        client.policy  # noqa: B018
+        self._clients.put(client_id, client)
+        return client
+
+    def invalidate(self, client_id: str) -> None:
+        self._clients.pop(client_id)
+
+    def invalidate_tenant(self, tenant: Tenant) -> None:
+        # The cache cannot be searched by tenant, and tenants change rarely
+        self.clear()
+
+    def clear(self) -> None:
+        self._clients.clear()
+
+
+client_cache = ClientCache()
+
+
+def warm_clients() -> int:
+    """Load the clients that were issued the most tokens during the last day."""
+    count = settings.CACHE_WARMUP_CLIENTS
+    if count <= 0:
+        return 0
+    client_ids = (
+        OAuth2Token.objects.filter(issued_at__gte=now_timestamp() - 86400)
+        .values("client_id")
+        .annotate(tokens=Count("id"))
+        .order_by("-tokens")
+        .values_list("client_id", flat=True)[:count]
+    )
+    loaded = 0
+    for client_id in client_ids:
+        if client_cache.get(client_id) is not None:
+            loaded += 1
+    return loaded
+
+
+def invalidate_cached_client(
+    sender: type,
+    instance: OAuth2Client,
+    **kwargs: Any,
+) -> None:
+    client_cache.invalidate(instance.client_id)
+
+
+def invalidate_cached_tenant_clients(
+    sender: type,
+    instance: Tenant,
+    **kwargs: Any,
+) -> None:
+    client_cache.invalidate_tenant(instance)
@@ -7,7 +7,6 @@ from authlib.oauth2 import OAuth2Request
 from authlib.oauth2.rfc6749 import InvalidClientError
 from django.urls import reverse
 
-from sso2.core.models import Tenant
 from sso2.oauth.models.oauth2_client_model import OAuth2Client, OAuth2ClientCredential
 
 JWT_BEARER_ASSERTION_TYPE = "urn:ietf:params:oauth:client-assertion-type:jwt-bearer"
@@ -52,9 +51,7 @@ class JWTClientAuth:
         MAY overwrite this method to create a more strict options."""
         # https://tools.ietf.org/html/rfc7523#section-3
         # The Audience SHOULD be the URL of the Authorization Server's Token Endpoint
-        tenant_id = request.uri.split("/")[4]
-        tenant = Tenant.get_or_404(tenant_id=tenant_id)
-        value = reverse("oauth2-token", kwargs={"tenant_id": tenant.id})
+        value = reverse("oauth2-token")
         options = {
             "iss": {"essential": True, "validate": _validate_iss},
             "sub": {"essential": True},
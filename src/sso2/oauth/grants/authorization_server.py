@@ -2,23 +2,29 @@ import time
 import uuid
 from typing import Any, cast
 
-from authlib.integrations.django_oauth2 import AuthorizationServer, RevocationEndpoint
-from authlib.jose import jwt
+from authlib.common.encoding import json_loads, urlsafe_b64decode
+from authlib.integrations.django_oauth2 import AuthorizationServer
 from authlib.oauth2 import OAuth2Request
 from authlib.oauth2.rfc6749 import ClientCredentialsGrant, ImplicitGrant
 from authlib.oauth2.rfc6750 import BearerTokenGenerator
 from django.http import HttpRequest, HttpResponse
 
+from sso2.core.keyring import keyring
 from sso2.core.models.user_model import User
+from sso2.oauth.client_cache import client_cache
 from sso2.oauth.grants.authentication_methods import JWTClientAuth
 from sso2.oauth.grants.authorization_code import MyAuthorizationCodeGrant
 from sso2.oauth.grants.code_challenge import MyCodeChallenge
-from sso2.oauth.grants.introspection_endpoint import MyIntrospectionEndpoint
+from sso2.oauth.grants.introspection_endpoint import (
+    BatchIntrospectionEndpoint,
+    MyIntrospectionEndpoint,
+)
 from sso2.oauth.grants.openid_hybrid import MyOpenIDHybridGrant
 from sso2.oauth.grants.openid_implicit import MyOpenIDImplicitGrant
 from sso2.oauth.grants.openidcode import MyOpenIDCode
 from sso2.oauth.grants.password import MyPasswordGrant
 from sso2.oauth.grants.refresh_token import MyRefreshTokenGrant
+from sso2.oauth.grants.revocation_endpoint import MyRevocationEndpoint
 from sso2.oauth.models.oauth2_client_model import OAuth2Client
 from sso2.oauth.models.oauth2_token_model import OAuth2Token
 
@@ -35,26 +41,22 @@ def access_token_generator(
     user: User | None = None,
     scope: str | None = None,
 ) -> str:
-    tenant = client.tenant
-    private_key = tenant.get_private_key()
+    signing_key = keyring.get(client.tenant)
     now = int(time.time())
     if sub and user:
         raise TypeError
     if sub is None:
         if grant_type == "client_credentials":
             sub = client.client_id
-        if user and scope and "openid" in scope:
+        # Stateless access tokens have no row linking them to their user,
+        # so every user token carries its subject
+        if user:
             sub = user.pk
     if exp is None:
         exp = now + 3600
     if iss is None:
-        iss = tenant.get_issuer()
+        iss = signing_key.issuer
 
-    header = {
-        "typ": "at+JWT",
-        "alg": tenant.algorithm,
-        "kid": private_key.thumbprint(),
-    }
     payload = {
         # FIXME: reasonable default (issuer) and fetch from 'resource' parameter
         #  to authorize endpoint
@@ -65,10 +67,22 @@ def access_token_generator(
         "jti": uuid.uuid4().hex,
         "iat": now,
         "iss": iss,
+        "scope": scope or "",
         "sub": sub,
     }
 
-    return str(jwt.encode(header, payload, private_key).decode())
+    return signing_key.sign(payload)
+
+
+def get_access_token_jti(access_token: str) -> str:
+    """Return the jti of an access token made by access_token_generator().
+
+    The token was just signed by us, so its payload is read without
+    verifying the signature.
+    """
+    payload_segment = access_token.split(".")[1]
+    payload = json_loads(urlsafe_b64decode(payload_segment.encode("ascii")))
+    return cast(str, payload["jti"])
 
 
 class MyAuthorizationServer(AuthorizationServer):  # type: ignore[misc]
@@ -78,13 +92,38 @@ class MyAuthorizationServer(AuthorizationServer):  # type: ignore[misc]
         generator.access_token_generator = access_token_generator
         return generator
 
-    def save_token(self, token: dict[str, Any], request: OAuth2Request) -> OAuth2Token:
+    def query_client(self, client_id: str) -> OAuth2Client | None:
+        return client_cache.get(client_id)
+
+    def create_oauth2_request(self, request: HttpRequest) -> OAuth2Request:
+        oauth2_request = super().create_oauth2_request(request)
+        # Resolved by TenantMiddleware from the host the request was made to
+        oauth2_request.tenant = getattr(request, "tenant", None)
+        oauth2_request.remote_addr = request.META.get("REMOTE_ADDR")
+        return oauth2_request
+
+    def save_token(
+        self,
+        token: dict[str, Any],
+        request: OAuth2Request,
+    ) -> OAuth2Token | None:
         """Default method for ``AuthorizationServer.save_token``. Developers MAY
         rewrite this function to meet their own needs.
         """
         client = request.client
+        fields = dict(token)
+        access_token = fields.pop("access_token")
+        refresh_token = fields.pop("refresh_token", None)
+        if client.stateless_access_tokens and not refresh_token:
+            return None
         user_id = request.user.pk if request.user else None
-        item = self.token_model(client_id=client.client_id, user_id=user_id, **token)
+        item = self.token_model(client_id=client.client_id, user_id=user_id, **fields)
+        item.access_token_jti = get_access_token_jti(access_token)
+        # Stateless access tokens are only signed, the refresh token is kept
+        if not client.stateless_access_tokens:
+            item.set_access_token(access_token)
+        if refresh_token:
+            item.set_refresh_token(refresh_token)
         item.save()
         return cast(OAuth2Token, item)
 
@@ -110,8 +149,9 @@ class MyAuthorizationServer(AuthorizationServer):  # type: ignore[misc]
 
 
 server = MyAuthorizationServer(OAuth2Client, OAuth2Token)
-server.register_endpoint(RevocationEndpoint)
+server.register_endpoint(MyRevocationEndpoint)
 server.register_endpoint(MyIntrospectionEndpoint)
+server.register_endpoint(BatchIntrospectionEndpoint)
 server.register_grant(
     MyAuthorizationCodeGrant,
     [
@@ -0,0 +1,60 @@
+"""ID token generation with at_hash/c_hash support for every signing
+algorithm the tenants can use.
+
+authlib derives the hash from the digits of the algorithm name, so it
+finds none for EdDSA and would put null hashes in the token. For EdDSA
+with Ed25519, the only curve tenant keys are created with, OpenID Connect
+uses SHA-512.
+"""
+import hashlib
+from typing import TYPE_CHECKING, Any
+
+from authlib.common.encoding import to_bytes, to_native, urlsafe_b64encode
+from authlib.oidc.core.grants.util import generate_id_token as authlib_id_token
+
+if TYPE_CHECKING:
+    from authlib.oidc.core import UserInfo
+    from authlib.oidc.core.grants import OpenIDImplicitGrant
+
+
+def create_half_hash(value: str, alg: str) -> str:
+    """The left-most half of the hash of value, for at_hash and c_hash."""
+    if alg == "EdDSA":
+        digest = hashlib.sha512(to_bytes(value)).digest()
+    else:
+        digest = hashlib.new(f"sha{alg[2:]}", to_bytes(value)).digest()
+    return to_native(urlsafe_b64encode(digest[: len(digest) // 2]))
+
+
+def generate_id_token(
+    token: dict[str, Any],
+    user_info: "UserInfo",
+    *,
+    alg: str,
+    code: str | None = None,
+    **config: Any,
+) -> str:
+    claims = dict(user_info)
+    if code:
+        claims["c_hash"] = create_half_hash(code, alg)
+    access_token = token.get("access_token")
+    if access_token:
+        claims["at_hash"] = create_half_hash(access_token, alg)
+    # The hashes are passed as claims so authlib computes none itself
+    return authlib_id_token({}, claims, alg=alg, **config)
+
+
+def process_implicit_token(
+    grant: "OpenIDImplicitGrant",
+    token: dict[str, Any],
+    code: str | None = None,
+) -> dict[str, Any]:
+    """OpenIDImplicitGrant.process_implicit_token() using generate_id_token."""
+    config = grant.get_jwt_config()
+    config["aud"] = grant.get_audiences(grant.request)
+    config["nonce"] = grant.request.data.get("nonce")
+    if code is not None:
+        config["code"] = code
+    user_info = grant.generate_user_info(grant.request.user, token["scope"])
+    token["id_token"] = generate_id_token(token, user_info, **config)
+    return token
@@ -1,10 +1,27 @@
-from typing import NotRequired, TypedDict, cast
+import dataclasses
+import uuid
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, NotRequired, TypedDict, cast
 
+from authlib.consts import default_json_headers
+from authlib.jose import JoseError, jwt
+from authlib.jose.errors import ExpiredTokenError
 from authlib.oauth2 import OAuth2Request
+from authlib.oauth2.rfc6749 import InvalidRequestError, UnsupportedTokenTypeError
 from authlib.oauth2.rfc7662 import IntrospectionEndpoint
+from django.conf import settings
 
+from sso2.core.keyring import keyring
+from sso2.core.models import Tenant, User
+from sso2.core.revoked_tokens import revoked_tokens
+from sso2.core.timeutils import now_timestamp
+from sso2.oauth.client_cache import client_cache
+from sso2.oauth.introspection_cache import introspection_cache
 from sso2.oauth.models.oauth2_client_model import OAuth2Client
-from sso2.oauth.models.oauth2_token_model import OAuth2Token
+from sso2.oauth.models.oauth2_token_model import OAuth2Token, token_digest
+
+if TYPE_CHECKING:
+    from authlib.jose import JWTClaims
 
 
 class IntrospectedToken(TypedDict):
@@ -21,20 +38,131 @@ class IntrospectedToken(TypedDict):
     iat: int
 
 
+@dataclasses.dataclass(frozen=True)
+class JWTAccessToken:
+    """A JWT access token signed by the tenant, introspected from its claims
+    instead of its OAuth2Token row. Revoked tokens are found in the
+    RevokedToken deny list, see OAuth2Token.revoke()."""
+
+    tenant_id: uuid.UUID
+    claims: "JWTClaims"
+
+    def is_expired(self) -> bool:
+        return self.claims["exp"] < now_timestamp()
+
+    def is_revoked(self) -> bool:
+        return revoked_tokens.is_revoked(self.tenant_id, self.claims["jti"])
+
+    @property
+    def user_id(self) -> Any:
+        # Client credentials tokens are issued with the client as subject,
+        # user tokens issued before every one of them had a sub have none
+        sub = self.claims.get("sub")
+        if sub == self.claims["client_id"]:
+            return None
+        return sub
+
+
 class MyIntrospectionEndpoint(IntrospectionEndpoint):  # type: ignore[misc]
-    def query_token(self, token: str, token_type_hint: str) -> OAuth2Token:
+    def create_endpoint_response(
+        self,
+        request: OAuth2Request,
+    ) -> tuple[int, IntrospectedToken, list[tuple[str, str]]]:
+        client = self.authenticate_endpoint_client(request)
+        token_string = request.form.get("token")
+        hint = request.form.get("token_type_hint")
+        if token_string:
+            cached = introspection_cache.get(client.tenant, token_string, hint)
+            if cached is not None:
+                return 200, cached, default_json_headers
+
+        token = self.authenticate_token(request, client)
+        body = self.create_introspection_payload(token)
+        if body["active"]:
+            introspection_cache.put(
+                client.tenant,
+                token_string,
+                hint,
+                body,
+                jti=get_deny_list_jti(token, token_string),
+            )
+        return 200, body, default_json_headers
+
+    def authenticate_token(
+        self,
+        request: OAuth2Request,
+        client: OAuth2Client,
+    ) -> OAuth2Token | JWTAccessToken | None:
+        token = request.form.get("token")
+        hint = request.form.get("token_type_hint")
+        if token and hint in (None, "access_token"):
+            access_token: OAuth2Token | JWTAccessToken | None
+            access_token = self.query_jwt_access_token(token, client.tenant)
+            if access_token is not None:
+                if "scope" not in access_token.claims:
+                    # Issued before access tokens carried their scope, the
+                    # row has it and knows whether the token was revoked
+                    access_token = self.query_token(token, hint) or access_token
+                if self.check_permission(access_token, client, request):
+                    return access_token
+                return None
+        return super().authenticate_token(request, client)
+
+    def query_jwt_access_token(
+        self,
+        token: str,
+        tenant: Tenant,
+    ) -> JWTAccessToken | None:
+        """Verify a JWT access token of the tenant without the database.
+
+        Returns None for opaque and refresh tokens, and for tokens that are
+        not signed by the tenant. A token that verifies was issued by us, it
+        is answered from its claims even when they have no sub.
+        """
+        if token.count(".") != 2:  # noqa: PLR2004
+            return None
+        try:
+            claims = jwt.decode(
+                token,
+                keyring.get(tenant).key_set,
+                claims_options={
+                    "iss": {"essential": True, "values": [tenant.get_issuer()]},
+                    "client_id": {"essential": True},
+                    "exp": {"essential": True},
+                    "jti": {"essential": True},
+                },
+            )
+        except (JoseError, ValueError):
+            return None
+        try:
+            claims.validate()
+        except ExpiredTokenError:
+            # Answered as inactive, see JWTAccessToken.is_expired()
+            pass
+        except JoseError:
+            return None
+        return JWTAccessToken(tenant_id=tenant.id, claims=claims)
+
+    def query_token(self, token: str, token_type_hint: str) -> OAuth2Token | None:
         if token_type_hint == "access_token":  # noqa: S105
-            tok = OAuth2Token.objects.filter(access_token=token).first()
+            tok = OAuth2Token.get_by_access_token(token)
         elif token_type_hint == "refresh_token":  # noqa: S105
-            tok = OAuth2Token.objects.filter(refresh_token=token).first()
+            tok = OAuth2Token.get_by_refresh_token(token)
         else:
             # without token_type_hint
-            tok = OAuth2Token.objects.filter(access_token=token).first()
+            tok = OAuth2Token.get_by_access_token(token)
             if not tok:
-                tok = OAuth2Token.objects.filter(refresh_token=token).first()
-        return cast(OAuth2Token, tok)
+                tok = OAuth2Token.get_by_refresh_token(token)
+        return tok
 
-    def introspect_token(self, token: OAuth2Token) -> IntrospectedToken:
+    def introspect_token(
+        self,
+        token: OAuth2Token | JWTAccessToken,
+    ) -> IntrospectedToken:
+        if isinstance(token, JWTAccessToken):
+            return self.introspect_jwt_access_token(token)
+        client = client_cache.get(token.client_id)
+        assert client is not None
         sub = None
         username = None
         email = None
@@ -51,17 +179,149 @@ class MyIntrospectionEndpoint(IntrospectionEndpoint):  # type: ignore[misc]
             "scope": token.get_scope(),
             "sub": sub,
             "aud": token.client_id,
-            "iss": OAuth2Client.objects.get(
-                client_id=token.client_id,
-            ).tenant.get_issuer(),
+            "iss": client.tenant.get_issuer(),
             "exp": token.get_expires_at(),
             "iat": token.issued_at,
         }
 
+    def introspect_jwt_access_token(
+        self,
+        token: JWTAccessToken,
+        users: dict[Any, User] | None = None,
+    ) -> IntrospectedToken:
+        """Introspect token, users maps ids to users loaded beforehand."""
+        claims = token.claims
+        client_id = claims["client_id"]
+        sub = None
+        username = None
+        email = None
+        if token.user_id is not None:
+            if users is None:
+                users = get_users([token.user_id])
+            user = users.get(token.user_id)
+            if user is None:
+                return cast(IntrospectedToken, {"active": False})
+            sub = user.pk
+            username = user.username
+            email = user.email
+        return {
+            "active": True,
+            "client_id": client_id,
+            "token_type": "Bearer",
+            "username": username,
+            "email": email,
+            "scope": claims.get("scope", ""),
+            "sub": sub,
+            "aud": client_id,
+            "iss": claims["iss"],
+            "exp": claims["exp"],
+            "iat": claims["iat"],
+        }
+
     def check_permission(
         self,
-        token: str,
+        token: OAuth2Token | JWTAccessToken,
         client: OAuth2Client,
         request: OAuth2Request,
     ) -> bool:
         return True
+
+
+class BatchIntrospectionEndpoint(MyIntrospectionEndpoint):
+    """Introspects up to ``settings.INTROSPECTION_BATCH_SIZE`` tokens, given
+    as repeated ``token`` parameters, in a single request.
+
+    The results are returned in the order of the tokens. JWT access tokens
+    are verified like MyIntrospectionEndpoint does, the others are looked up
+    together with their users in one query.
+    """
+
+    ENDPOINT_NAME = "batch_introspection"
+
+    def create_endpoint_response(
+        self,
+        request: OAuth2Request,
+    ) -> tuple[int, dict[str, list[IntrospectedToken]], list[tuple[str, str]]]:
+        client = self.authenticate_endpoint_client(request)
+        tokens = request.form.getlist("token")
+        if not tokens:
+            raise InvalidRequestError
+        if len(tokens) > settings.INTROSPECTION_BATCH_SIZE:
+            raise InvalidRequestError(
+                f"At most {settings.INTROSPECTION_BATCH_SIZE} tokens can be "
+                f"introspected at once",
+            )
+        hint = request.form.get("token_type_hint")
+        if hint and hint not in self.SUPPORTED_TOKEN_TYPES:
+            raise UnsupportedTokenTypeError
+
+        found = self.query_tokens(tokens, hint, client.tenant)
+        users = get_users(
+            token.user_id
+            for token in found.values()
+            if isinstance(token, JWTAccessToken) and token.user_id is not None
+        )
+
+        results = []
+        for token in tokens:
+            item = found.get(token)
+            if (
+                item is None
+                or item.is_expired()
+                or item.is_revoked()
+                or not self.check_permission(item, client, request)
+            ):
+                results.append(cast(IntrospectedToken, {"active": False}))
+            elif isinstance(item, JWTAccessToken):
+                results.append(self.introspect_jwt_access_token(item, users))
+            else:
+                results.append(self.introspect_token(item))
+        return 200, {"results": results}, default_json_headers
+
+    def query_tokens(
+        self,
+        tokens: list[str],
+        token_type_hint: str | None,
+        tenant: Tenant,
+    ) -> dict[str, OAuth2Token | JWTAccessToken]:
+        access_tokens: dict[str, JWTAccessToken] = {}
+        if token_type_hint in (None, "access_token"):
+            for token in tokens:
+                access_token = self.query_jwt_access_token(token, tenant)
+                if access_token is not None:
+                    access_tokens[token] = access_token
+        found: dict[str, OAuth2Token | JWTAccessToken] = dict(access_tokens)
+        # Access tokens issued before they carried their scope are answered
+        # from their row when it exists, as in authenticate_token()
+        remaining = [
+            token
+            for token in tokens
+            if token not in access_tokens or "scope" not in access_tokens[token].claims
+        ]
+        if remaining:
+            found.update(
+                OAuth2Token.get_many(remaining, token_type_hint=token_type_hint),
+            )
+        return found
+
+
+def get_deny_list_jti(
+    token: OAuth2Token | JWTAccessToken,
+    token_string: str,
+) -> str | None:
+    """The jti to check against the deny list, None for refresh tokens."""
+    if isinstance(token, JWTAccessToken):
+        return cast(str, token.claims["jti"])
+    if token.access_token_digest is not None and bytes(
+        token.access_token_digest,
+    ) == token_digest(token_string):
+        return token.access_token_jti or None
+    return None
+
+
+def get_users(user_ids: Iterable[Any]) -> dict[Any, User]:
+    """Load the users of JWT access tokens by their id, with one query."""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return {}
+    return User.objects.only("username", "email").in_bulk(user_ids)
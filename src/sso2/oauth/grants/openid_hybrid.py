@@ -1,8 +1,12 @@
+from typing import Any
+
 from authlib.oauth2 import OAuth2Request
 from authlib.oidc.core import OpenIDHybridGrant, UserInfo
 
+from sso2.core.keyring import keyring
 from sso2.core.models.user_model import User
 from sso2.core.types import JwtConfig
+from sso2.oauth.grants.id_token import process_implicit_token
 from sso2.oauth.models.authorization_code_model import AuthorizationCode
 
 
@@ -34,14 +38,14 @@ class MyOpenIDHybridGrant(OpenIDHybridGrant):  # type: ignore[misc]
             return False
 
     def get_jwt_config(self) -> JwtConfig:
-        tenant = self.client
-        private_key = tenant.get_private_key()
-        return {
-            "key": private_key.as_dict(is_private=True, alg="RS512", use="sig"),
-            "alg": "RS512",
-            "iss": tenant.get_issuer(),
-            "exp": 3600,
-        }
+        return keyring.get(self.client.tenant).get_jwt_config()
+
+    def process_implicit_token(
+        self,
+        token: dict[str, Any],
+        code: str | None = None,
+    ) -> dict[str, Any]:
+        return process_implicit_token(self, token, code)
 
     def generate_user_info(self, user: User, scope: str) -> UserInfo:
         user_info = UserInfo(sub=user.id, name=user.username)
@@ -1,9 +1,14 @@
+from typing import Any
+
 from authlib.oauth2 import OAuth2Request
 from authlib.oidc.core import OpenIDCode, UserInfo
+from authlib.oidc.core.grants.util import is_openid_scope
 
+from sso2.core.keyring import keyring
 from sso2.core.models.user_model import User
 from sso2.core.types import JwtConfig
 from sso2.oauth.grants.authorization_code import MyAuthorizationCodeGrant
+from sso2.oauth.grants.id_token import generate_id_token
 from sso2.oauth.models.authorization_code_model import AuthorizationCode
 
 
@@ -12,14 +17,26 @@ class MyOpenIDCode(OpenIDCode):  # type: ignore[misc]
         return AuthorizationCode.exists_nonce(nonce, request.client_id)
 
     def get_jwt_config(self, grant: MyAuthorizationCodeGrant) -> JwtConfig:
-        tenant = grant.client.tenant
-        private_key = tenant.get_private_key()
-        return {
-            "key": private_key.as_dict(is_private=True, alg="RS256", use="sig"),
-            "alg": "RS256",
-            "iss": tenant.get_issuer(),
-            "exp": 3600,
-        }
+        return keyring.get(grant.client.tenant).get_jwt_config()
+
+    def process_token(
+        self,
+        grant: MyAuthorizationCodeGrant,
+        token: dict[str, Any],
+    ) -> dict[str, Any]:
+        scope = token.get("scope")
+        if not scope or not is_openid_scope(scope):
+            return token
+
+        request = grant.request
+        config = self.get_jwt_config(grant)
+        config["aud"] = self.get_audiences(request)
+        if request.authorization_code:
+            config["nonce"] = request.authorization_code.get_nonce()
+            config["auth_time"] = request.authorization_code.get_auth_time()
+        user_info = self.generate_user_info(request.user, scope)
+        token["id_token"] = generate_id_token(token, user_info, **config)
+        return token
 
     def generate_user_info(self, user: User, scope: str) -> UserInfo:
         user_info = UserInfo(sub=str(user.pk), name=user.username)
@@ -1,20 +1,55 @@
-from authlib.oauth2.rfc6749 import ResourceOwnerPasswordCredentialsGrant
+from authlib.oauth2.rfc6749 import (
+    InvalidRequestError,
+    ResourceOwnerPasswordCredentialsGrant,
+    UnauthorizedClientError,
+)
 
-from sso2.core.models import Tenant
+from sso2.core.login_throttle import throttle_login
 from sso2.core.models.user_model import User
+from sso2.core.password_hashing import check_dummy_password, check_password
 
 
 class MyPasswordGrant(ResourceOwnerPasswordCredentialsGrant):  # type: ignore[misc]
     TOKEN_ENDPOINT_AUTH_METHODS = ["client_secret_basic", "client_secret_post"]
 
+    def validate_token_request(self) -> None:
+        # As authlib's, but throttled on the authenticated client, which
+        # authlib only sets on the request after authenticate_user()
+        client = self.authenticate_token_endpoint_client()
+        if not client.check_grant_type(self.GRANT_TYPE):
+            raise UnauthorizedClientError
+
+        params = self.request.form
+        if "username" not in params:
+            raise InvalidRequestError('Missing "username" in request.')
+        if "password" not in params:
+            raise InvalidRequestError('Missing "password" in request.')
+
+        tenant = self.request.tenant
+        if tenant is not None:
+            # Refused attempts must not cost a password hash
+            throttle_login(
+                tenant_id=tenant.id,
+                username=params["username"],
+                ip=self.request.remote_addr,
+                client_id=client.client_id,
+            )
+        user = self.authenticate_user(params["username"], params["password"])
+        if not user:
+            raise InvalidRequestError('Invalid "username" or "password" in request.')
+        self.request.client = client
+        self.request.user = user
+        self.validate_requested_scope()
+
     def authenticate_user(self, username: str, password: str) -> User | None:
-        tenant_id = self.request.uri.split("/")[4]
-        tenant = Tenant.get_or_404(tenant_id=tenant_id)
+        tenant = self.request.tenant
+        if tenant is None:
+            return None
 
         try:
             user = User.objects.get(username=username, tenant=tenant)
-            if user.check_password(password):
+            if check_password(user, password):
                 return user
         except User.DoesNotExist:
-            pass
+            check_dummy_password(tenant.id, password)
         return None
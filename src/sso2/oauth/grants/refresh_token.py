@@ -5,21 +5,14 @@ from sso2.oauth.models.oauth2_token_model import OAuth2Token
 
 
 class MyRefreshTokenGrant(RefreshTokenGrant):  # type: ignore[misc]
-    def authenticate_refresh_token(
-        self,
-        refresh_token: OAuth2Token,
-    ) -> OAuth2Token | None:
-        try:
-            item = OAuth2Token.objects.get(refresh_token=refresh_token)
-            if item.is_refresh_token_active():
-                return item
-        except OAuth2Token.DoesNotExist:
-            pass
+    def authenticate_refresh_token(self, refresh_token: str) -> OAuth2Token | None:
+        item = OAuth2Token.get_by_refresh_token(refresh_token)
+        if item is not None and item.is_refresh_token_active():
+            return item
         return None
 
     def authenticate_user(self, credential: OAuth2Token) -> User | None:
         return credential.user
 
     def revoke_old_credential(self, credential: OAuth2Token) -> None:
-        credential.revoked = True
-        credential.save()
+        credential.revoke(tenant=self.request.client.tenant)
@@ -0,0 +1,85 @@
+import dataclasses
+
+from authlib.integrations.django_oauth2 import RevocationEndpoint
+from authlib.jose import JoseError, jwt
+from authlib.oauth2 import OAuth2Request
+
+from sso2.core.keyring import keyring
+from sso2.core.models import RevokedToken, Tenant
+from sso2.oauth.models.oauth2_client_model import OAuth2Client
+from sso2.oauth.models.oauth2_token_model import OAuth2Token
+
+
+@dataclasses.dataclass(frozen=True)
+class StatelessAccessToken:
+    """A JWT access token issued to a client in stateless mode, these
+    do not have an OAuth2Token row which can be marked as revoked."""
+
+    tenant: Tenant
+    client_id: str
+    jti: str
+    exp: int
+
+
+class MyRevocationEndpoint(RevocationEndpoint):  # type: ignore[misc]
+    def query_token(self, token: str, token_type_hint: str) -> OAuth2Token | None:
+        if token_type_hint == "access_token":  # noqa: S105
+            return OAuth2Token.get_by_access_token(token)
+        if token_type_hint == "refresh_token":  # noqa: S105
+            return OAuth2Token.get_by_refresh_token(token)
+        tok = OAuth2Token.get_by_access_token(token)
+        if tok is None:
+            tok = OAuth2Token.get_by_refresh_token(token)
+        return tok
+
+    def authenticate_token(
+        self,
+        request: OAuth2Request,
+        client: OAuth2Client,
+    ) -> OAuth2Token | StatelessAccessToken | None:
+        token = super().authenticate_token(request, client)
+        hint = request.form.get("token_type_hint")
+        if token is None and hint != "refresh_token":
+            token = self.query_stateless_token(request.form["token"], client)
+        return token
+
+    def query_stateless_token(
+        self,
+        token: str,
+        client: OAuth2Client,
+    ) -> StatelessAccessToken | None:
+        tenant = client.tenant
+        try:
+            claims = jwt.decode(
+                token,
+                keyring.get(tenant).key_set,
+                claims_options={
+                    "iss": {"essential": True, "values": [tenant.get_issuer()]},
+                    "client_id": {"essential": True, "values": [client.client_id]},
+                    "exp": {"essential": True},
+                    "jti": {"essential": True},
+                },
+            )
+            claims.validate()
+        except (JoseError, ValueError):
+            return None
+        return StatelessAccessToken(
+            tenant=tenant,
+            client_id=claims["client_id"],
+            jti=claims["jti"],
+            exp=claims["exp"],
+        )
+
+    def revoke_token(
+        self,
+        token: OAuth2Token | StatelessAccessToken,
+        request: OAuth2Request,
+    ) -> None:
+        if isinstance(token, StatelessAccessToken):
+            RevokedToken.revoke(
+                tenant=token.tenant,
+                jti=token.jti,
+                expires_at=token.exp,
+            )
+        else:
+            token.revoke(tenant=request.client.tenant)
@@ -0,0 +1,105 @@
+"""In-process cache of introspection responses, keyed by token digest."""
+import dataclasses
+import uuid
+from typing import TYPE_CHECKING, Any
+
+from sso2.core.lru import LRUCache
+from sso2.core.models import Tenant
+from sso2.core.revoked_tokens import revoked_tokens
+from sso2.core.timeutils import now_timestamp
+from sso2.oauth.client_cache import client_cache
+from sso2.oauth.models.oauth2_token_model import OAuth2Token, token_digest
+
+if TYPE_CHECKING:
+    from sso2.oauth.grants.introspection_endpoint import IntrospectedToken
+
+TOKEN_TYPE_HINTS = (None, "access_token", "refresh_token")
+
+
+@dataclasses.dataclass(frozen=True)
+class CachedIntrospection:
+    # jti of the access token, checked against the RevokedToken deny list
+    jti: str | None
+    response: "IntrospectedToken"
+
+
+class IntrospectionCache:
+    """Resource servers introspect the same tokens many times per second.
+
+    Responses for active tokens are kept in an LRU cache of
+    ``settings.INTROSPECTION_CACHE_SIZE`` entries for
+    ``settings.INTROSPECTION_CACHE_TTL`` seconds, and never past the
+    token's expiry. Every hit checks the token's jti against the in-memory
+    RevokedToken deny list, which is how other worker processes learn of
+    revoked access tokens. Entries are keyed by tenant, a token introspected
+    by a client of another tenant is a miss. Revoking an OAuth2Token row also drops its
+    responses right away in the current process. Other workers see revoked
+    opaque and refresh tokens when their entry expires.
+    """
+
+    def __init__(self) -> None:
+        self._responses: LRUCache[
+            tuple[uuid.UUID, str | None, bytes],
+            CachedIntrospection,
+        ] = LRUCache(
+            "introspection_responses",
+            size_setting="INTROSPECTION_CACHE_SIZE",
+            ttl_setting="INTROSPECTION_CACHE_TTL",
+        )
+
+    def get(
+        self,
+        tenant: Tenant,
+        token: str,
+        token_type_hint: str | None,
+    ) -> "IntrospectedToken | None":
+        key = (tenant.id, token_type_hint, token_digest(token))
+        cached = self._responses.get(key)
+        if cached is None:
+            return None
+        if cached.response["exp"] < now_timestamp() or (
+            cached.jti is not None and revoked_tokens.is_revoked(tenant.id, cached.jti)
+        ):
+            self._responses.pop(key)
+            return None
+        return cached.response
+
+    def put(
+        self,
+        tenant: Tenant,
+        token: str,
+        token_type_hint: str | None,
+        response: "IntrospectedToken",
+        *,
+        jti: str | None,
+    ) -> None:
+        self._responses.put(
+            (tenant.id, token_type_hint, token_digest(token)),
+            CachedIntrospection(jti=jti, response=response),
+        )
+
+    def invalidate(self, tenant_id: uuid.UUID, digest: bytes) -> None:
+        for token_type_hint in TOKEN_TYPE_HINTS:
+            self._responses.pop((tenant_id, token_type_hint, digest))
+
+    def clear(self) -> None:
+        self._responses.clear()
+
+
+introspection_cache = IntrospectionCache()
+
+
+def invalidate_introspected_token(
+    sender: type,
+    instance: OAuth2Token,
+    **kwargs: Any,
+) -> None:
+    # Saving a token only turns it inactive, by revoking it
+    client = client_cache.get(instance.client_id)
+    if client is None:
+        # Without its client the token's tenant is unknown
+        introspection_cache.clear()
+        return
+    for digest in (instance.access_token_digest, instance.refresh_token_digest):
+        if digest is not None:
+            introspection_cache.invalidate(client.tenant.id, bytes(digest))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("oauth", "0007_application_add_created_at_and_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="oauth2client",
+            name="stateless_access_tokens",
+            field=models.BooleanField(default=False),
+        ),
+    ]
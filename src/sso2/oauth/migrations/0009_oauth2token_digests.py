@@ -0,0 +1,93 @@
+# Generated by Django 4.2 on 2026-10-18 10:05
+import hashlib
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+
+def _digest(token: str) -> bytes | None:
+    if not token:
+        return None
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+BATCH_SIZE = 2000
+
+
+def store_token_digests(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    token_model_class = apps.get_model("oauth", "OAuth2Token")
+    tokens = token_model_class.objects.filter(access_token_digest__isnull=True)
+    batch = []
+    for token in tokens.only("access_token", "refresh_token").iterator(
+        chunk_size=BATCH_SIZE,
+    ):
+        token.access_token_digest = _digest(token.access_token)
+        token.refresh_token_digest = _digest(token.refresh_token)
+        batch.append(token)
+        if len(batch) == BATCH_SIZE:
+            token_model_class.objects.bulk_update(
+                batch,
+                ["access_token_digest", "refresh_token_digest"],
+            )
+            batch = []
+    token_model_class.objects.bulk_update(
+        batch,
+        ["access_token_digest", "refresh_token_digest"],
+    )
+
+
+def fill_empty_access_tokens(
+    apps: Apps,
+    schema_editor: BaseDatabaseSchemaEditor,
+) -> None:
+    """Rows created after the migration only have digests, the raw token
+    cannot be restored. Give them distinct placeholders so the unique
+    access_token column can be recreated, such tokens stop working."""
+    token_model_class = apps.get_model("oauth", "OAuth2Token")
+    tokens = token_model_class.objects.filter(access_token="")
+    batch = []
+    for token in tokens.only("pk").iterator(chunk_size=BATCH_SIZE):
+        token.access_token = f"unrestorable-{token.pk}"
+        batch.append(token)
+        if len(batch) == BATCH_SIZE:
+            token_model_class.objects.bulk_update(batch, ["access_token"])
+            batch = []
+    token_model_class.objects.bulk_update(batch, ["access_token"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("oauth", "0008_oauth2client_stateless_access_tokens"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="oauth2token",
+            name="access_token_digest",
+            field=models.BinaryField(max_length=32, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name="oauth2token",
+            name="refresh_token_digest",
+            field=models.BinaryField(db_index=True, max_length=32, null=True),
+        ),
+        migrations.RunPython(
+            store_token_digests,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AlterField(
+            model_name="oauth2token",
+            name="access_token",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AlterField(
+            model_name="oauth2token",
+            name="refresh_token",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.RunPython(
+            migrations.RunPython.noop,
+            reverse_code=fill_empty_access_tokens,
+        ),
+    ]
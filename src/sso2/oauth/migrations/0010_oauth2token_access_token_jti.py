@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("oauth", "0009_oauth2token_digests"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="oauth2token",
+            name="access_token_jti",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
@@ -1,6 +1,8 @@
-from typing import TYPE_CHECKING, Self
+import dataclasses
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Self
 
-from authlib.oauth2.rfc6749 import ClientMixin, list_to_scope, scope_to_list
+from authlib.oauth2.rfc6749 import ClientMixin, list_to_scope
 from django.db.models import (
     CASCADE,
     BooleanField,
@@ -36,6 +38,26 @@ AUTH_METHODS = [
 ]
 
 
+@dataclasses.dataclass(frozen=True)
+class ClientPolicy:
+    """The space separated fields of a client, split once."""
+
+    scopes: frozenset[str]
+    redirect_uris: tuple[str, ...]
+    redirect_uri_set: frozenset[str]
+    response_types: frozenset[str]
+
+    @classmethod
+    def from_client(cls, client: "OAuth2Client") -> "ClientPolicy":
+        redirect_uris = tuple(dict.fromkeys(client.allowed_callback_uris.split()))
+        return cls(
+            scopes=frozenset(client.scope.split()),
+            redirect_uris=redirect_uris,
+            redirect_uri_set=frozenset(redirect_uris),
+            response_types=frozenset(client.response_type.split()),
+        )
+
+
 class OAuth2Client(Model, ClientMixin):  # type: ignore[misc]
     class Meta:
         verbose_name = "OAuth2 Client"
@@ -107,25 +129,42 @@ class OAuth2Client(Model, ClientMixin):  # type: ignore[misc]
         verbose_name="Require PKCE",
     )
 
+    # JWT access tokens are self-contained (RFC 9068), so in stateless mode
+    # they are only signed and never stored. Only refresh tokens are saved
+    # and revoked access tokens are tracked by their jti.
+    stateless_access_tokens = BooleanField(default=False)
+
     def __str__(self) -> str:
         return self.client_name
 
+    @cached_property
+    def policy(self) -> ClientPolicy:
+        return ClientPolicy.from_client(self)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        super().save(*args, **kwargs)
+        self.__dict__.pop("policy", None)
+
+    def refresh_from_db(self, *args: Any, **kwargs: Any) -> None:
+        super().refresh_from_db(*args, **kwargs)
+        self.__dict__.pop("policy", None)
+
     def get_client_id(self) -> str:
         return self.client_id
 
     def get_default_redirect_uri(self) -> str | None:
-        if self.allowed_callback_uris:
-            return self.allowed_callback_uris.split()[0]
+        if self.policy.redirect_uris:
+            return self.policy.redirect_uris[0]
         return None
 
     def get_allowed_scope(self, scope: str) -> str:
         if not scope:
             return ""
-        allowed = set(scope_to_list(self.scope))
+        allowed = self.policy.scopes
         return str(list_to_scope([s for s in scope.split() if s in allowed]))
 
     def check_redirect_uri(self, redirect_uri: str) -> bool:
-        return redirect_uri in self.allowed_callback_uris.split()
+        return redirect_uri in self.policy.redirect_uri_set
 
     def check_client_secret(self, client_secret: str) -> bool:
         return self.client_secret == client_secret
@@ -137,8 +176,7 @@ class OAuth2Client(Model, ClientMixin):  # type: ignore[misc]
         return True
 
     def check_response_type(self, response_type: str) -> bool:
-        allowed = self.response_type.split()
-        return response_type in allowed
+        return response_type in self.policy.response_types
 
     def check_grant_type(self, grant_type: str) -> bool:
         match grant_type:
@@ -161,14 +199,14 @@ class OAuth2Client(Model, ClientMixin):  # type: ignore[misc]
         return OAuth2AuthorizedApp.objects.filter(
             user=user,
             client=self,
-            tenant=self.tenant,
+            tenant_id=self.tenant_id,
         ).exists()
 
     def authorize(self, *, scope: str, user: "User") -> None:
         OAuth2AuthorizedApp.objects.create(
             user=user,
             client=self,
-            tenant=self.tenant,
+            tenant_id=self.tenant_id,
             scope=scope,
         )
 
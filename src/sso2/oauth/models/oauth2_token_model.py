@@ -1,17 +1,33 @@
+import hashlib
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
 from authlib.oauth2.rfc6749 import TokenMixin
 from django.db.models import (
     CASCADE,
+    BinaryField,
     BooleanField,
     CharField,
     ForeignKey,
     IntegerField,
     Model,
+    Q,
     TextField,
 )
 
+from sso2.core.models.revoked_token_model import RevokedToken
 from sso2.core.models.user_model import User
 from sso2.core.timeutils import now_timestamp
 
+if TYPE_CHECKING:
+    from sso2.core.models import Tenant
+    from sso2.oauth.models.oauth2_client_model import OAuth2Client
+
+
+def token_digest(token: str) -> bytes:
+    """Return the SHA-256 digest a token is stored and looked up by."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
 
 class OAuth2Token(Model, TokenMixin):  # type: ignore[misc]
     class Meta:
@@ -22,13 +38,91 @@ class OAuth2Token(Model, TokenMixin):  # type: ignore[misc]
     user = ForeignKey(User, on_delete=CASCADE, null=True)
     client_id = CharField(max_length=48, db_index=True)
     token_type = CharField(max_length=40)
-    access_token = CharField(max_length=255, unique=True, null=False)
-    refresh_token = CharField(max_length=255, db_index=True)
+    # Only the digests are stored and indexed, the raw tokens are only set
+    # on rows created before digests were introduced.
+    access_token = TextField(default="", blank=True)
+    refresh_token = TextField(default="", blank=True)
+    # null when only the refresh token is stored (stateless access tokens)
+    access_token_digest = BinaryField(max_length=32, unique=True, null=True)
+    refresh_token_digest = BinaryField(max_length=32, db_index=True, null=True)
+    # jti claim of the JWT access token, recorded in the RevokedToken deny
+    # list when the token is revoked
+    access_token_jti = CharField(max_length=64, blank=True, default="")
     scope = TextField(default="")
     revoked = BooleanField(default=False)
     issued_at = IntegerField(null=False, default=now_timestamp)
     expires_in = IntegerField(null=False, default=0)
 
+    @classmethod
+    def get_by_access_token(cls, access_token: str) -> "OAuth2Token | None":
+        return cls.objects.filter(
+            access_token_digest=token_digest(access_token),
+        ).first()
+
+    @classmethod
+    def get_by_refresh_token(cls, refresh_token: str) -> "OAuth2Token | None":
+        return cls.objects.filter(
+            refresh_token_digest=token_digest(refresh_token),
+        ).first()
+
+    @classmethod
+    def get_many(
+        cls,
+        tokens: Iterable[str],
+        *,
+        token_type_hint: str | None = None,
+    ) -> dict[str, "OAuth2Token"]:
+        """Look up access and refresh tokens, with their users, in one query.
+
+        Returns a mapping from each token that was found to its row. Without
+        a token_type_hint, tokens are matched as access tokens first.
+        """
+        by_digest = {token_digest(token): token for token in tokens}
+        if not by_digest:
+            return {}
+        query = Q()
+        if token_type_hint != "refresh_token":  # noqa: S105
+            query |= Q(access_token_digest__in=by_digest)
+        if token_type_hint != "access_token":  # noqa: S105
+            query |= Q(refresh_token_digest__in=by_digest)
+
+        found: dict[str, OAuth2Token] = {}
+        by_refresh_token: dict[str, OAuth2Token] = {}
+        for item in cls.objects.filter(query).select_related("user"):
+            # memoryview on PostgreSQL
+            access_digest = item.access_token_digest
+            if access_digest is not None and bytes(access_digest) in by_digest:
+                found[by_digest[bytes(access_digest)]] = item
+            refresh_digest = item.refresh_token_digest
+            if refresh_digest is not None and bytes(refresh_digest) in by_digest:
+                by_refresh_token[by_digest[bytes(refresh_digest)]] = item
+        if token_type_hint == "access_token":  # noqa: S105
+            return found
+        if token_type_hint == "refresh_token":  # noqa: S105
+            return by_refresh_token
+        return {**by_refresh_token, **found}
+
+    def set_access_token(self, access_token: str) -> None:
+        self.access_token_digest = token_digest(access_token)
+
+    def set_refresh_token(self, refresh_token: str) -> None:
+        self.refresh_token_digest = token_digest(refresh_token)
+
+    def revoke(self, *, tenant: "Tenant") -> None:
+        """Revoke the token, and its JWT access token wherever it is verified
+        without this row (API requests and introspection)."""
+        self.revoked = True
+        self.save(update_fields=["revoked"])
+        if self.access_token_jti and not self.is_access_token_expired():
+            RevokedToken.revoke(
+                tenant=tenant,
+                jti=self.access_token_jti,
+                expires_at=self.get_expires_at(),
+            )
+
+    def check_client(self, client: "OAuth2Client") -> bool:
+        return self.client_id == client.get_client_id()
+
     def get_client_id(self) -> str:
         return self.client_id
 
@@ -42,7 +136,13 @@ class OAuth2Token(Model, TokenMixin):  # type: ignore[misc]
         return self.issued_at + self.expires_in
 
     def is_expired(self) -> bool:
-        return self.revoked or self.get_expires_at() < now_timestamp()
+        return self.revoked or self.is_access_token_expired()
+
+    def is_access_token_expired(self) -> bool:
+        return self.get_expires_at() < now_timestamp()
 
     def is_revoked(self) -> bool:
         return self.revoked
+
+    def is_refresh_token_active(self) -> bool:
+        return not self.revoked
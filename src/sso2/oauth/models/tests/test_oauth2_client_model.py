@@ -0,0 +1,36 @@
+import pytest
+
+from sso2.core.models import Tenant
+from sso2.oauth.models.oauth2_client_model import OAuth2Client
+
+
+def test_client_policy(tenant: Tenant) -> None:
+    client = OAuth2Client.create_example(tenant=tenant, response_type="code token")
+    client.allowed_callback_uris = " ".join(
+        f"https://pr-{i}.example.com/callback" for i in [3, 1, 2, 1]
+    )
+    policy = client.policy
+    assert client.policy is policy
+    assert policy.redirect_uris == (
+        "https://pr-3.example.com/callback",
+        "https://pr-1.example.com/callback",
+        "https://pr-2.example.com/callback",
+    )
+    assert client.get_default_redirect_uri() == "https://pr-3.example.com/callback"
+    assert client.check_redirect_uri("https://pr-2.example.com/callback")
+    assert not client.check_redirect_uri("https://pr-4.example.com/callback")
+    assert client.check_response_type("token")
+    assert not client.check_response_type("id_token")
+    assert client.get_allowed_scope("openid address email") == "openid email"
+    assert not client.get_allowed_scope("")
+
+
+@pytest.mark.django_db
+def test_client_policy_reset_on_save(tenant: Tenant) -> None:
+    client = OAuth2Client.create_example(tenant=tenant)
+    client.client_id = "POLICY"
+    assert client.get_default_redirect_uri() == "https://example.com/callback"
+
+    client.allowed_callback_uris = ""
+    client.save()
+    assert client.get_default_redirect_uri() is None
@@ -2,15 +2,13 @@ import urllib.parse
 from urllib.parse import urljoin
 
 from django.contrib.auth.views import redirect_to_login
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 
-from sso2.core.models.tenant_model import Tenant
 from sso2.core.types import HttpRequestWithUser
 from sso2.oauth.grants.authorization_server import server
-from sso2.oauth.models.oauth2_client_model import OAuth2Client
 
 
 # https://auth0.com/docs/get-started/apis/scopes/openid-connect-scopes
@@ -33,15 +31,16 @@ def human_friendly_scope(scope: str) -> str:
 
 @require_http_methods(["GET", "POST"])
 def oauth2_authorize(request: HttpRequestWithUser) -> HttpResponse:
-    tenant_name = request.headers["HOST"].rsplit(".", 2)[0]
-    tenant = Tenant.get_or_404(tenant_id=tenant_name)
+    tenant = getattr(request, "tenant", None)
+    if tenant is None:
+        raise Http404
     if not request.user.is_authenticated:
         resolved_login_url = reverse("login")
         url = urllib.parse.urlparse(request.build_absolute_uri())
         next_url = urllib.parse.parse_qs(url.query)["redirect_uri"][0]
         return redirect_to_login(
             next=next_url,
-            login_url=urljoin(f"https://{tenant_name}.i-1.app", resolved_login_url),
+            login_url=urljoin(f"https://{tenant.name}.i-1.app", resolved_login_url),
         )
 
     grant = server.get_consent_grant(request, end_user=request.user)
@@ -63,10 +62,10 @@ def oauth2_authorize(request: HttpRequestWithUser) -> HttpResponse:
             },
         )
     elif request.POST.get("confirm") == "Allow":
+        if client.tenant_id != tenant.id or client.client_id != request.POST.get(
+            "client_id",
+        ):
+            raise Http404
         grant_user = request.user
-        client = OAuth2Client.objects.get(
-            tenant=tenant,
-            client_id=request.POST["client_id"],
-        )
         client.authorize(scope=request.POST.get("scope"), user=request.user)
     return server.create_authorization_response(request, grant_user=grant_user)
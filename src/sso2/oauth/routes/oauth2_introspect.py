@@ -3,13 +3,25 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from sso2.oauth.grants.authorization_server import server
-from sso2.oauth.grants.introspection_endpoint import MyIntrospectionEndpoint
+from sso2.oauth.grants.introspection_endpoint import (
+    BatchIntrospectionEndpoint,
+    MyIntrospectionEndpoint,
+)
 
 
 @require_http_methods(["POST"])
 @csrf_exempt
-def oauth2_introspect(request: HttpRequest, tenant_id: str) -> HttpResponse:
+def oauth2_introspect(request: HttpRequest) -> HttpResponse:
     return server.create_endpoint_response(
         name=MyIntrospectionEndpoint.ENDPOINT_NAME,
         request=request,
     )
+
+
+@require_http_methods(["POST"])
+@csrf_exempt
+def oauth2_introspect_batch(request: HttpRequest) -> HttpResponse:
+    return server.create_endpoint_response(
+        name=BatchIntrospectionEndpoint.ENDPOINT_NAME,
+        request=request,
+    )
@@ -1,14 +1,39 @@
 from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from rest_framework.exceptions import AuthenticationFailed
 
+from sso2.core.drfauth import parse_authorization_header
 from sso2.core.types import HttpRequestWithUser
 
 
+def invalid_token_response(description: str) -> JsonResponse:
+    response = JsonResponse(
+        {"error": "invalid_token", "error_description": description},
+        status=401,
+    )
+    response["WWW-Authenticate"] = 'Bearer error="invalid_token"'
+    return response
+
+
 @require_http_methods(["GET"])
 @csrf_exempt
 def oauth2_userinfo(request: HttpRequestWithUser) -> HttpResponse:
     user = request.user
+    authorization_header = request.headers.get("Authorization")
+    if authorization_header is not None:
+        # Verified and checked for revocation without a database query
+        # when the token was seen recently, see parse_authorization_header()
+        tenant = getattr(request, "tenant", None)
+        if tenant is None:
+            return invalid_token_response("Unknown tenant")
+        try:
+            user = parse_authorization_header(
+                authorization_header=authorization_header,
+                tenant=tenant,
+            ).user
+        except AuthenticationFailed as e:
+            return invalid_token_response(str(e.detail))
     user_info = {
         "sub": user.id,
         "name": user.username,
@@ -1,58 +1,139 @@
+import dataclasses
+import datetime
+import hashlib
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urljoin
 
-from django.http import HttpResponse, JsonResponse
+from authlib.common.encoding import json_dumps
+from django.conf import settings
+from django.http import HttpResponse
 from django.urls import reverse
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import condition, require_http_methods
 
+from sso2.core.lru import LRUCache
+from sso2.core.models import Tenant
 from sso2.core.types import HttpRequestWithUser
+from sso2.core.warmup import get_hottest_tenants
+
+if TYPE_CHECKING:
+    import uuid
+
+
+def build_configuration(tenant: Tenant) -> dict[str, Any]:
+    issuer = tenant.get_issuer()
+    return {
+        "issuer": tenant.get_issuer(),
+        "authorization_endpoint": urljoin(issuer, reverse("oauth2-authorize")),
+        "token_endpoint": urljoin(issuer, reverse("oauth2-token")),
+        "userinfo_endpoint": urljoin(issuer, reverse("oauth2-userinfo")),
+        "token_endpoint_auth_methods_supported": [
+            "client_secret_basic",
+            "client_secret_post",
+            "none",
+            "private_key_jwt",
+        ],
+        "token_endpoint_auth_signing_alg_values_supported": [
+            "RS256",
+        ],
+        "jwks_uri": urljoin(issuer, reverse("jwks")),
+        "response_types_supported": [
+            "code",
+            "code id_token",
+            "id_token",
+            "token id_token",
+        ],
+        "acr_values_supported": [],
+        "subject_types_supported": ["public", "pairwise"],
+        "userinfo_signing_alg_values_supported": [
+            "RS512",
+            "RS256",
+            "ES256",
+            "HS256",
+        ],
+        "userinfo_encryption_alg_values_supported": ["RSA1_5", "A128KW"],
+        "userinfo_encryption_enc_values_supported": ["A128CBC-HS256", "A128GCM"],
+        "id_token_signing_alg_values_supported": [
+            tenant.algorithm,
+        ],
+        "id_token_encryption_alg_values_supported": ["RSA1_5", "A128KW"],
+        "id_token_encryption_enc_values_supported": ["A128CBC-HS256", "A128GCM"],
+        "request_object_signing_alg_values_supported": ["RS256"],
+        "claims_supported": ["sub", "iss", "auth_time", "acr", "name", "email"],
+        "claims_parameter_supported": True,
+        "ui_locales_supported": ["en-US"],
+    }
+
+
+@dataclasses.dataclass(frozen=True)
+class ConfigurationDocument:
+    content: bytes
+    etag: str
+    last_modified: datetime.datetime
+
+    @classmethod
+    def from_tenant(cls, tenant: Tenant) -> "ConfigurationDocument":
+        content = json_dumps(build_configuration(tenant)).encode("utf-8")
+        return cls(
+            content=content,
+            etag=hashlib.sha256(content).hexdigest(),
+            # Saved with the tenant, so every worker reports the same time
+            last_modified=tenant.updated_at.replace(microsecond=0),
+        )
+
+
+class ConfigurationCache:
+    """Serialized discovery documents of the
+    ``settings.OPENID_CONFIGURATION_CACHE_SIZE`` most recently requested
+    tenants.
+
+    Documents are keyed by the tenant's id and modification time, so a
+    changed tenant gets a new document as soon as the worker's TenantCache
+    loads the new row.
+    """
+
+    def __init__(self) -> None:
+        self._documents: LRUCache[
+            tuple["uuid.UUID", datetime.datetime],
+            ConfigurationDocument,
+        ] = LRUCache(
+            "openid_configurations",
+            size_setting="OPENID_CONFIGURATION_CACHE_SIZE",
+        )
+
+    def get(self, tenant: Tenant) -> ConfigurationDocument:
+        return self._documents.get_or_set(
+            (tenant.id, tenant.updated_at),
+            lambda: ConfigurationDocument.from_tenant(tenant),
+        )
+
+    def clear(self) -> None:
+        self._documents.clear()
+
+
+configuration_cache = ConfigurationCache()
+
+
+def warm_configurations() -> int:
+    tenants = get_hottest_tenants(settings.CACHE_WARMUP_TENANTS)
+    for tenant in tenants:
+        configuration_cache.get(tenant)
+    return len(tenants)
+
+
+def configuration_etag(request: HttpRequestWithUser) -> str:
+    return configuration_cache.get(request.tenant).etag
+
+
+def configuration_last_modified(request: HttpRequestWithUser) -> datetime.datetime:
+    return configuration_cache.get(request.tenant).last_modified
 
 
 @require_http_methods(["GET"])
+@condition(etag_func=configuration_etag, last_modified_func=configuration_last_modified)
 def openid_well_known_configuration(
     request: HttpRequestWithUser,
 ) -> HttpResponse:
-    tenant = request.tenant
-    issuer = tenant.get_issuer()
-    return JsonResponse(
-        {
-            "issuer": tenant.get_issuer(),
-            "authorization_endpoint": urljoin(issuer, reverse("oauth2-authorize")),
-            "token_endpoint": urljoin(issuer, reverse("oauth2-token")),
-            "userinfo_endpoint": urljoin(issuer, reverse("oauth2-userinfo")),
-            "token_endpoint_auth_methods_supported": [
-                "client_secret_basic",
-                "client_secret_post",
-                "none",
-                "private_key_jwt",
-            ],
-            "token_endpoint_auth_signing_alg_values_supported": [
-                "RS256",
-            ],
-            "jwks_uri": urljoin(issuer, reverse("jwks")),
-            "response_types_supported": [
-                "code",
-                "code id_token",
-                "id_token",
-                "token id_token",
-            ],
-            "acr_values_supported": [],
-            "subject_types_supported": ["public", "pairwise"],
-            "userinfo_signing_alg_values_supported": [
-                "RS512",
-                "RS256",
-                "ES256",
-                "HS256",
-            ],
-            "userinfo_encryption_alg_values_supported": ["RSA1_5", "A128KW"],
-            "userinfo_encryption_enc_values_supported": ["A128CBC-HS256", "A128GCM"],
-            "id_token_signing_alg_values_supported": [
-                "RS256",
-            ],
-            "id_token_encryption_alg_values_supported": ["RSA1_5", "A128KW"],
-            "id_token_encryption_enc_values_supported": ["A128CBC-HS256", "A128GCM"],
-            "request_object_signing_alg_values_supported": ["RS256"],
-            "claims_supported": ["sub", "iss", "auth_time", "acr", "name", "email"],
-            "claims_parameter_supported": True,
-            "ui_locales_supported": ["en-US"],
-        },
-    )
+    document = configuration_cache.get(request.tenant)
+    response = HttpResponse(document.content, content_type="application/json")
+    response.headers["Cache-Control"] = "public, max-age=86400"
+    return response
@@ -1,17 +1,20 @@
-from authlib.jose import KeySet
-from django.http import HttpResponse, JsonResponse
-from django.views.decorators.http import require_http_methods
+from django.http import HttpResponse
+from django.views.decorators.http import condition, require_http_methods
 
-from sso2.core.keyutils import JwsAlgorithm
+from sso2.core.keyring import keyring
 from sso2.core.types import HttpRequestWithUser
 
 
+def jwks_etag(request: HttpRequestWithUser) -> str:
+    return keyring.get(request.tenant).jwks_etag
+
+
 @require_http_methods(["GET"])
+@condition(etag_func=jwks_etag)
 def openid_well_known_jwks(request: HttpRequestWithUser) -> HttpResponse:
-    key_set = KeySet([request.tenant.get_private_key()])
-    data = key_set.as_dict(is_private=False, alg=JwsAlgorithm.RS256, use="sig")
-    response = JsonResponse(data)
+    signing_key = keyring.get(request.tenant)
+    response = HttpResponse(signing_key.jwks, content_type="application/json")
     response.headers[
         "Cache-Control"
-    ] = "public, max_age=3600, stale-while-revalidate=3600, stale-if-error=3600"
+    ] = "public, max-age=3600, stale-while-revalidate=3600, stale-if-error=3600"
     return response
@@ -0,0 +1,281 @@
+import base64
+import http
+from typing import Any, cast
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from pytest_django.fixtures import SettingsWrapper
+
+from sso2.core.lru import caches
+from sso2.core.models import Tenant, User
+from sso2.core.revoked_tokens import revoked_tokens
+from sso2.core.types import AssertNumQueries
+from sso2.oauth.grants.authorization_server import access_token_generator
+from sso2.oauth.grants.introspection_endpoint import IntrospectedToken
+from sso2.oauth.introspection_cache import introspection_cache
+from sso2.oauth.models.oauth2_client_model import OAuth2Client
+from sso2.oauth.models.oauth2_token_model import OAuth2Token
+
+
+def create_client(tenant: Tenant, client_id: str, **fields: bool) -> dict[str, str]:
+    oauth2_client = OAuth2Client.create_example(tenant=tenant)
+    oauth2_client.client_id = client_id
+    for name, value in fields.items():
+        setattr(oauth2_client, name, value)
+    oauth2_client.save()
+    auth = base64.b64encode(
+        f"{oauth2_client.client_id}:{oauth2_client.client_secret}".encode("ascii"),
+    ).decode("ascii")
+    return {"HTTP_HOST": "test.i-1.app", "HTTP_AUTHORIZATION": f"Basic {auth}"}
+
+
+def introspect(test_client: Client, token: str, **headers: str) -> dict[str, Any]:
+    response = test_client.post(
+        reverse("oauth2-introspect"),
+        data={"token": token},
+        **headers,
+    )
+    assert response.status_code == http.HTTPStatus.OK
+    result: dict[str, Any] = response.json()
+    return result
+
+
+@pytest.mark.django_db
+def test_introspect_stateless_access_token(
+    test_client: Client,
+    tenant: Tenant,
+    django_assert_num_queries: AssertNumQueries,
+) -> None:
+    headers = create_client(
+        tenant,
+        "INTROSPECTSTATELESS",
+        authorization_code_grant=False,
+        client_credentials_grant=True,
+        stateless_access_tokens=True,
+    )
+    response = test_client.post(
+        reverse("oauth2-token"),
+        data={"grant_type": "client_credentials", "scope": "email"},
+        **headers,
+    )
+    assert response.status_code == http.HTTPStatus.OK
+    access_token = response.json()["access_token"]
+
+    revoked_tokens.refresh(force=True)
+    introspect(test_client, access_token, **headers)
+    with django_assert_num_queries(0):
+        result = introspect(test_client, access_token, **headers)
+    assert result["active"] is True
+    assert result["client_id"] == "INTROSPECTSTATELESS"
+    assert result["scope"] == "email"
+    assert result["sub"] is None
+    assert result["iss"] == tenant.get_issuer()
+
+    response = test_client.post(
+        reverse("oauth2-revoke"),
+        data={"token": access_token},
+        **headers,
+    )
+    assert response.status_code == http.HTTPStatus.OK
+    assert introspect(test_client, access_token, **headers) == {"active": False}
+
+
+@pytest.mark.django_db
+def test_introspect_revoked_access_token(
+    test_client: Client,
+    tenant: Tenant,
+    user: User,
+) -> None:
+    user.set_password("introspect")
+    user.save()
+    headers = create_client(
+        tenant,
+        "INTROSPECTREVOKED",
+        authorization_code_grant=False,
+        password_grant=True,
+    )
+    response = test_client.post(
+        reverse("oauth2-token"),
+        data={
+            "grant_type": "password",
+            "username": user.username,
+            "password": "introspect",
+            "scope": "openid email",
+        },
+        **headers,
+    )
+    assert response.status_code == http.HTTPStatus.OK
+    access_token = response.json()["access_token"]
+
+    result = introspect(test_client, access_token, **headers)
+    assert result["active"] is True
+    assert result["sub"] == user.pk
+    assert result["username"] == user.username
+    assert result["email"] == user.email
+    assert result["scope"] == "openid email"
+
+    # As done when its refresh token is rotated
+    token = OAuth2Token.objects.get(client_id="INTROSPECTREVOKED")
+    token.revoke(tenant=tenant)
+    assert introspect(test_client, access_token, **headers) == {"active": False}
+
+
+@pytest.mark.django_db
+def test_introspect_batch(
+    test_client: Client,
+    tenant: Tenant,
+    user: User,
+    settings: SettingsWrapper,
+    django_assert_num_queries: AssertNumQueries,
+) -> None:
+    headers = create_client(
+        tenant,
+        "INTROSPECTBATCH",
+        authorization_code_grant=False,
+        client_credentials_grant=True,
+    )
+    response = test_client.post(
+        reverse("oauth2-token"),
+        data={"grant_type": "client_credentials"},
+        **headers,
+    )
+    assert response.status_code == http.HTTPStatus.OK
+    access_token = response.json()["access_token"]
+    for opaque_token, scope in [("opaque-1", "email"), ("opaque-2", "profile")]:
+        token = OAuth2Token(
+            client_id="INTROSPECTBATCH",
+            user=user,
+            scope=scope,
+            expires_in=3600,
+        )
+        token.set_access_token(opaque_token)
+        token.save()
+    tokens = ["opaque-2", access_token, "unknown", "opaque-1"]
+
+    revoked_tokens.refresh(force=True)
+    with django_assert_num_queries(1):
+        response = test_client.post(
+            reverse("oauth2-introspect-batch"),
+            data={"token": tokens},
+            **headers,
+        )
+    assert response.status_code == http.HTTPStatus.OK
+    results = response.json()["results"]
+    assert [result["active"] for result in results] == [True, True, False, True]
+    assert [result.get("scope") for result in results] == [
+        "profile",
+        "",
+        None,
+        "email",
+    ]
+    assert results[0]["username"] == user.username
+
+    settings.INTROSPECTION_BATCH_SIZE = 3
+    response = test_client.post(
+        reverse("oauth2-introspect-batch"),
+        data={"token": tokens},
+        **headers,
+    )
+    assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_introspection_cache(
+    test_client: Client,
+    tenant: Tenant,
+    user: User,
+    django_assert_num_queries: AssertNumQueries,
+) -> None:
+    introspection_cache.clear()
+    headers = create_client(tenant, "INTROSPECTCACHE")
+    token = OAuth2Token(
+        client_id="INTROSPECTCACHE",
+        user=user,
+        scope="email",
+        expires_in=3600,
+    )
+    token.set_access_token("opaque-cached")
+    token.save()
+    revoked_tokens.refresh(force=True)
+
+    stats = caches["introspection_responses"].stats()
+    result = introspect(test_client, "opaque-cached", **headers)
+    assert result["active"] is True
+    with django_assert_num_queries(0):
+        assert introspect(test_client, "opaque-cached", **headers) == result
+    assert caches["introspection_responses"].stats().hits == stats.hits + 1
+
+    token.revoke(tenant=tenant)
+    assert introspect(test_client, "opaque-cached", **headers) == {"active": False}
+
+
+@pytest.mark.django_db
+def test_introspection_cache_other_tenant(tenant: Tenant) -> None:
+    introspection_cache.clear()
+    response = cast(IntrospectedToken, {"active": True, "exp": 2**31})
+    introspection_cache.put(tenant, "shared-token", None, response, jti=None)
+
+    stats = caches["introspection_responses"].stats()
+    assert introspection_cache.get(Tenant(name="other"), "shared-token", None) is None
+    after = caches["introspection_responses"].stats()
+    assert (after.hits, after.misses) == (stats.hits, stats.misses + 1)
+    assert introspection_cache.get(tenant, "shared-token", None) is response
+
+
+@pytest.mark.django_db
+def test_introspect_stateless_user_token(
+    test_client: Client,
+    tenant: Tenant,
+    user: User,
+) -> None:
+    user.set_password("introspect")
+    user.save()
+    headers = create_client(
+        tenant,
+        "INTROSPECTSTATELESSUSER",
+        authorization_code_grant=False,
+        password_grant=True,
+        stateless_access_tokens=True,
+    )
+    response = test_client.post(
+        reverse("oauth2-token"),
+        data={
+            "grant_type": "password",
+            "username": user.username,
+            "password": "introspect",
+            "scope": "email",
+        },
+        **headers,
+    )
+    assert response.status_code == http.HTTPStatus.OK
+    assert not OAuth2Token.objects.filter(client_id="INTROSPECTSTATELESSUSER").exists()
+
+    result = introspect(test_client, response.json()["access_token"], **headers)
+    assert result["active"] is True
+    assert result["sub"] == user.pk
+    assert result["username"] == user.username
+    assert result["scope"] == "email"
+
+
+@pytest.mark.django_db
+def test_introspect_access_token_without_sub(
+    test_client: Client,
+    tenant: Tenant,
+) -> None:
+    headers = create_client(
+        tenant,
+        "INTROSPECTNOSUB",
+        stateless_access_tokens=True,
+    )
+    oauth2_client = OAuth2Client.objects.get(client_id="INTROSPECTNOSUB")
+    # Verifies against the tenant's keys, so it is answered from its claims
+    # although no row exists and it names no subject
+    access_token = access_token_generator(client=oauth2_client, scope="email")
+
+    result = introspect(test_client, access_token, **headers)
+    assert result["active"] is True
+    assert result["sub"] is None
+    assert result["username"] is None
+    assert result["client_id"] == "INTROSPECTNOSUB"
+    assert result["scope"] == "email"
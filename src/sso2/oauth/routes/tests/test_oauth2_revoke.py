@@ -0,0 +1,94 @@
+import base64
+import http
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+
+from sso2.core.drfauth import parse_authorization_header
+from sso2.core.models import RevokedToken, Tenant
+from sso2.oauth.models.oauth2_client_model import OAuth2Client
+from sso2.oauth.models.oauth2_token_model import OAuth2Token, token_digest
+
+
+@pytest.mark.django_db
+def test_revoke_stateless_access_token(test_client: Client, tenant: Tenant) -> None:
+    oauth2_client = OAuth2Client.create_example(
+        tenant=tenant,
+        grant_type="client_credentials",
+    )
+    oauth2_client.client_id = "STATELESS"
+    oauth2_client.stateless_access_tokens = True
+    oauth2_client.save()
+    auth = base64.b64encode(
+        f"{oauth2_client.client_id}:{oauth2_client.client_secret}".encode("ascii"),
+    ).decode("ascii")
+    headers = {"HTTP_HOST": "test.i-1.app", "HTTP_AUTHORIZATION": f"Basic {auth}"}
+
+    response = test_client.post(
+        reverse("oauth2-token"),
+        data={"grant_type": "client_credentials"},
+        **headers,
+    )
+    assert response.status_code == http.HTTPStatus.OK
+    access_token = response.json()["access_token"]
+    assert not OAuth2Token.objects.filter(client_id=oauth2_client.client_id).exists()
+
+    response = test_client.post(
+        reverse("oauth2-revoke"),
+        data={"token": access_token, "token_type_hint": "access_token"},
+        **headers,
+    )
+    assert response.status_code == http.HTTPStatus.OK
+    revoked = RevokedToken.objects.get()
+    assert revoked.tenant == tenant
+
+    with pytest.raises(AuthenticationFailed, match="Token revoked"):
+        parse_authorization_header(
+            authorization_header=f"Bearer {access_token}",
+            tenant=tenant,
+        )
+
+
+@pytest.mark.django_db
+def test_revoke_access_token(test_client: Client, tenant: Tenant) -> None:
+    oauth2_client = OAuth2Client.create_example(
+        tenant=tenant,
+        grant_type="client_credentials",
+    )
+    oauth2_client.client_id = "STATEFUL"
+    oauth2_client.save()
+    auth = base64.b64encode(
+        f"{oauth2_client.client_id}:{oauth2_client.client_secret}".encode("ascii"),
+    ).decode("ascii")
+    headers = {"HTTP_HOST": "test.i-1.app", "HTTP_AUTHORIZATION": f"Basic {auth}"}
+
+    response = test_client.post(
+        reverse("oauth2-token"),
+        data={"grant_type": "client_credentials"},
+        **headers,
+    )
+    assert response.status_code == http.HTTPStatus.OK
+    access_token = response.json()["access_token"]
+    token = OAuth2Token.objects.get(client_id=oauth2_client.client_id)
+    assert not token.access_token
+    assert token.access_token_digest == token_digest(access_token)
+    assert OAuth2Token.get_by_access_token(access_token) == token
+
+    response = test_client.post(
+        reverse("oauth2-revoke"),
+        data={"token": access_token},
+        **headers,
+    )
+    assert response.status_code == http.HTTPStatus.OK
+    token.refresh_from_db()
+    assert token.revoked
+    # The JWT is also denied where it is verified without the token row
+    revoked = RevokedToken.objects.get()
+    assert revoked.jti == token.access_token_jti
+    with pytest.raises(AuthenticationFailed, match="Token revoked"):
+        parse_authorization_header(
+            authorization_header=f"Bearer {access_token}",
+            tenant=tenant,
+        )
@@ -0,0 +1,43 @@
+import base64
+import http
+from pathlib import Path
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from pytest_django.fixtures import SettingsWrapper
+
+from sso2.core.models import Tenant, User
+from sso2.oauth.models.oauth2_client_model import OAuth2Client
+
+
+@pytest.mark.django_db
+def test_password_grant_throttled_per_client(
+    settings: SettingsWrapper,
+    tmp_path: Path,
+    test_client: Client,
+    tenant: Tenant,
+    user: User,
+) -> None:
+    settings.LOGIN_THROTTLE_PATH = tmp_path / "buckets.sqlite3"
+    settings.LOGIN_THROTTLE_RATES = {
+        **settings.LOGIN_THROTTLE_RATES,
+        "client": (1, 600),
+    }
+    oauth2_client = OAuth2Client.create_example(tenant=tenant, grant_type="password")
+    oauth2_client.client_id = "THROTTLEDCLIENT"
+    oauth2_client.save()
+    auth = base64.b64encode(
+        f"{oauth2_client.client_id}:{oauth2_client.client_secret}".encode("ascii"),
+    ).decode("ascii")
+    # The client authenticates with client_secret_basic, so the form holds
+    # no client_id
+    headers = {"HTTP_HOST": "test.i-1.app", "HTTP_AUTHORIZATION": f"Basic {auth}"}
+    data = {"grant_type": "password", "username": user.username, "password": "wrong"}
+
+    response = test_client.post(reverse("oauth2-token"), data=data, **headers)
+    assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+    response = test_client.post(reverse("oauth2-token"), data=data, **headers)
+    assert response.status_code == http.HTTPStatus.TOO_MANY_REQUESTS
+    assert int(response["Retry-After"]) > 0
@@ -0,0 +1,59 @@
+import http
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from sso2.core.models import RevokedToken, Tenant, User
+from sso2.core.timeutils import now_timestamp
+from sso2.oauth.grants.authorization_server import (
+    access_token_generator,
+    get_access_token_jti,
+)
+from sso2.oauth.models.oauth2_client_model import OAuth2Client
+
+
+@pytest.mark.django_db
+def test_userinfo_bearer_token(test_client: Client, tenant: Tenant, user: User) -> None:
+    oauth2_client = OAuth2Client.create_example(tenant=tenant)
+    oauth2_client.client_id = "USERINFO"
+    oauth2_client.save()
+    access_token = access_token_generator(client=oauth2_client, sub=user.pk)
+    headers = {
+        "HTTP_HOST": "test.i-1.app",
+        "HTTP_AUTHORIZATION": f"Bearer {access_token}",
+    }
+
+    response = test_client.get(reverse("oauth2-userinfo"), **headers)
+    assert response.status_code == http.HTTPStatus.OK
+    assert response.json() == {
+        "sub": user.pk,
+        "name": user.username,
+        "email": user.email,
+        "email_verified": user.email_verified,
+    }
+
+    RevokedToken.revoke(
+        tenant=tenant,
+        jti=get_access_token_jti(access_token),
+        expires_at=now_timestamp() + 3600,
+    )
+    response = test_client.get(reverse("oauth2-userinfo"), **headers)
+    assert response.status_code == http.HTTPStatus.UNAUTHORIZED
+    assert response.json()["error_description"] == "Token revoked"
+
+
+@pytest.mark.django_db
+def test_userinfo_bearer_token_unknown_tenant(test_client: Client) -> None:
+    response = test_client.get(
+        reverse("oauth2-userinfo"),
+        HTTP_HOST="test.i-1.app",
+        HTTP_X_TENANT="missing",
+        HTTP_AUTHORIZATION="Bearer token",
+    )
+    assert response.status_code == http.HTTPStatus.UNAUTHORIZED
+    assert response.json() == {
+        "error": "invalid_token",
+        "error_description": "Unknown tenant",
+    }
+    assert response["WWW-Authenticate"] == 'Bearer error="invalid_token"'
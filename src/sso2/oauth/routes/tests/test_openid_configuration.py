@@ -0,0 +1,40 @@
+import http
+import json
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from django.utils.http import http_date
+
+from sso2.core.models import Tenant
+from sso2.oauth.routes.openid_configuration import configuration_cache
+
+
+@pytest.mark.django_db
+def test_openid_configuration(test_client: Client, tenant: Tenant) -> None:
+    url = reverse("openid-configuration")
+    response = test_client.get(url, HTTP_HOST="test.i-1.app")
+    assert response.status_code == http.HTTPStatus.OK
+    assert response["Cache-Control"] == "public, max-age=86400"
+    updated_at = Tenant.objects.get(pk=tenant.pk).updated_at
+    assert response["Last-Modified"] == http_date(updated_at.timestamp())
+    data = response.json()
+    assert data["issuer"] == tenant.get_issuer()
+    assert data["jwks_uri"] == tenant.get_issuer() + ".well-known/jwks.json"
+    assert data["id_token_signing_alg_values_supported"] == [tenant.algorithm]
+
+    etag = response["ETag"]
+    response = test_client.get(url, HTTP_HOST="test.i-1.app", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == http.HTTPStatus.NOT_MODIFIED
+
+    document = configuration_cache.get(tenant)
+    assert configuration_cache.get(tenant) is document
+    # A changed row gets a new document, also in workers that did not save it
+    changed = Tenant.objects.get(pk=tenant.pk)
+    changed.algorithm = "ES256"
+    changed.save()
+    assert configuration_cache.get(tenant) is document
+    document = configuration_cache.get(changed)
+    assert json.loads(document.content)["id_token_signing_alg_values_supported"] == [
+        "ES256",
+    ]
@@ -0,0 +1,43 @@
+import http
+
+import pytest
+from authlib.jose import JsonWebKey, jwt
+from django.test import Client
+from django.urls import reverse
+
+from sso2.core.key_rotation import rotate_signing_keys
+from sso2.core.keyring import keyring
+from sso2.core.models import Tenant
+
+
+@pytest.mark.django_db
+def test_jwks(test_client: Client, tenant: Tenant) -> None:
+    response = test_client.get(reverse("jwks"), HTTP_HOST="test.i-1.app")
+    assert response.status_code == http.HTTPStatus.OK
+    assert response["Content-Type"] == "application/json"
+    assert response["Cache-Control"].startswith("public, max-age=3600")
+    etag = response["ETag"]
+    assert etag == f'"{keyring.get(tenant).jwks_etag}"'
+
+    key_set = JsonWebKey.import_key_set(response.json())
+    token = keyring.get(tenant).sign({"iss": tenant.get_issuer()})
+    assert jwt.decode(token, key_set)["iss"] == tenant.get_issuer()
+
+    response = test_client.get(
+        reverse("jwks"),
+        HTTP_HOST="test.i-1.app",
+        HTTP_IF_NONE_MATCH=etag,
+    )
+    assert response.status_code == http.HTTPStatus.NOT_MODIFIED
+    assert not response.content
+
+
+@pytest.mark.django_db
+def test_jwks_publishes_next_key(test_client: Client, tenant: Tenant) -> None:
+    keys = rotate_signing_keys(tenant)
+    response = test_client.get(reverse("jwks"), HTTP_HOST="test.i-1.app")
+    assert response.status_code == http.HTTPStatus.OK
+    published = {key["kid"] for key in response.json()["keys"]}
+    assert published == {key.kid for key in keys}
+    assert keyring.get(tenant).kid == tenant.get_private_key().thumbprint()
+    keyring.invalidate(tenant.id)
@@ -0,0 +1,77 @@
+import base64
+import http
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from sso2.core.lru import caches
+from sso2.core.models import Tenant
+from sso2.core.types import AssertNumQueries
+from sso2.oauth.client_cache import client_cache
+from sso2.oauth.models.oauth2_client_model import OAuth2Client
+
+
+@pytest.mark.django_db
+def test_client_cache(
+    oauth2_client: OAuth2Client,
+    django_assert_num_queries: AssertNumQueries,
+) -> None:
+    client_cache.clear()
+    hits = caches["oauth2_clients"].stats().hits
+    with django_assert_num_queries(1):
+        client = client_cache.get(oauth2_client.client_id)
+        assert client is not None
+        assert client.tenant == oauth2_client.tenant
+    with django_assert_num_queries(0):
+        assert client_cache.get(oauth2_client.client_id) is client
+    assert client_cache.get("MISSING") is None
+
+    oauth2_client.save()
+    assert client_cache.get(oauth2_client.client_id) is not client
+    stats = caches["oauth2_clients"].stats()
+    assert (stats.size, stats.hits) == (1, hits + 1)
+
+
+@pytest.mark.django_db
+def test_client_cache_invalidated_by_tenant(
+    oauth2_client: OAuth2Client,
+    tenant: Tenant,
+) -> None:
+    client = client_cache.get(oauth2_client.client_id)
+    tenant.save()
+    assert client_cache.get(oauth2_client.client_id) is not client
+
+
+@pytest.mark.django_db
+def test_token_endpoint_uses_cached_client(
+    test_client: Client,
+    tenant: Tenant,
+    django_assert_num_queries: AssertNumQueries,
+) -> None:
+    oauth2_client = OAuth2Client.create_example(
+        tenant=tenant,
+        grant_type="client_credentials",
+    )
+    oauth2_client.client_id = "CACHED"
+    oauth2_client.stateless_access_tokens = True
+    oauth2_client.save()
+    auth = base64.b64encode(
+        f"{oauth2_client.client_id}:{oauth2_client.client_secret}".encode("ascii"),
+    ).decode("ascii")
+    headers = {"HTTP_HOST": "test.i-1.app", "HTTP_AUTHORIZATION": f"Basic {auth}"}
+
+    response = test_client.post(
+        reverse("oauth2-token"),
+        data={"grant_type": "client_credentials"},
+        **headers,
+    )
+    assert response.status_code == http.HTTPStatus.OK
+
+    with django_assert_num_queries(0):
+        response = test_client.post(
+            reverse("oauth2-token"),
+            data={"grant_type": "client_credentials"},
+            **headers,
+        )
+    assert response.status_code == http.HTTPStatus.OK
@@ -0,0 +1,51 @@
+import hashlib
+
+import pytest
+from authlib.common.encoding import to_native, urlsafe_b64encode
+from authlib.jose import jwt
+from authlib.oidc.core import UserInfo
+
+from sso2.core.keyring import SigningKey
+from sso2.core.keyutils import JwsAlgorithm
+from sso2.core.models import Tenant
+from sso2.oauth.grants.id_token import create_half_hash, generate_id_token
+
+
+def test_create_half_hash() -> None:
+    digest = hashlib.sha512(b"token").digest()
+    assert create_half_hash("token", "EdDSA") == to_native(
+        urlsafe_b64encode(digest[:32]),
+    )
+    digest = hashlib.sha384(b"token").digest()
+    assert create_half_hash("token", "ES384") == to_native(
+        urlsafe_b64encode(digest[:24]),
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "algorithm",
+    [JwsAlgorithm.RS256, JwsAlgorithm.ES256, JwsAlgorithm.EdDSA],
+)
+def test_generate_id_token(algorithm: JwsAlgorithm) -> None:
+    tenant = Tenant.create_example(
+        name=f"test-id-token-{algorithm.lower()}",
+        algorithm=algorithm,
+    )
+    signing_key = SigningKey.from_tenant(tenant)
+    config = signing_key.get_jwt_config()
+    id_token = generate_id_token(
+        {"access_token": "access-token"},
+        UserInfo(sub="1"),
+        code="code",
+        aud=["client"],
+        **config,
+    )
+
+    claims = jwt.decode(id_token, tenant.get_public_key())
+    # Relying parties pick the key from the JWKS by kid during key rotation
+    assert claims.header["kid"] == tenant.get_public_key().thumbprint()
+    assert claims.header["kid"] == signing_key.kid
+    assert claims["at_hash"] == create_half_hash("access-token", algorithm)
+    assert claims["c_hash"] == create_half_hash("code", algorithm)
+    assert claims["sub"] == "1"
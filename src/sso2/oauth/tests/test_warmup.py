@@ -0,0 +1,36 @@
+import pytest
+from django.utils import timezone
+from pytest_django.fixtures import SettingsWrapper
+
+from sso2.core.models import Tenant, User
+from sso2.core.types import AssertNumQueries
+from sso2.core.warmup import run_warmups
+from sso2.oauth.client_cache import client_cache
+from sso2.oauth.models.oauth2_client_model import OAuth2Client
+from sso2.oauth.models.oauth2_token_model import OAuth2Token
+
+
+@pytest.mark.django_db
+def test_oauth_warmups(
+    settings: SettingsWrapper,
+    tenant: Tenant,
+    user: User,
+    django_assert_num_queries: AssertNumQueries,
+) -> None:
+    settings.CACHE_WARMUP_TENANTS = 10
+    settings.CACHE_WARMUP_CLIENTS = 10
+    user.last_login = timezone.now()
+    user.save(update_fields=["last_login"])
+    oauth2_client = OAuth2Client.create_example(tenant=tenant)
+    oauth2_client.client_id = "WARMUPCLIENT"
+    oauth2_client.save()
+    token = OAuth2Token(client_id=oauth2_client.client_id, user=user)
+    token.set_access_token("access-token")
+    token.save()
+    client_cache.clear()
+
+    results = run_warmups()
+    assert results["clients"][0] == 1
+    assert results["openid-configuration"][0] == 1
+    with django_assert_num_queries(0):
+        assert client_cache.get(oauth2_client.client_id) is not None
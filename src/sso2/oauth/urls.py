@@ -1,7 +1,10 @@
 from django.urls import path
 
 from sso2.oauth.routes.oauth2_authorize import oauth2_authorize
-from sso2.oauth.routes.oauth2_introspect import oauth2_introspect
+from sso2.oauth.routes.oauth2_introspect import (
+    oauth2_introspect,
+    oauth2_introspect_batch,
+)
 from sso2.oauth.routes.oauth2_revoke import oauth2_revoke
 from sso2.oauth.routes.oauth2_token import oauth2_token
 from sso2.oauth.routes.oauth2_userinfo import oauth2_userinfo
@@ -29,6 +32,11 @@ urlpatterns = [
         oauth2_introspect,
         name="oauth2-introspect",
     ),
+    path(
+        "oauth/introspect/batch",
+        oauth2_introspect_batch,
+        name="oauth2-introspect-batch",
+    ),
     path(
         "oauth/revoke",
         oauth2_revoke,